@@ -1,8 +1,14 @@
+import time
+debut_imports = time.perf_counter()  # pour la mesure de la durée des imports (option --timing)
 from tkinter import *
 import numpy as np
-from math import sqrt, copysign
+from math import sqrt, copysign, ceil
 import sys, getopt
-import time
+import copy
+import threading
+import os
+from collections import deque
+from types import SimpleNamespace
 
 
 #---------------------------------------- Modèle ----------------------------------------#
@@ -32,6 +38,28 @@ class ImPix():
         self.mat_px = np.linspace(0, largeur, num=largeur, endpoint=False)[np.newaxis]
         self.mat_py = np.linspace(0, hauteur, num=hauteur, endpoint=False)[:,np.newaxis]
 
+    def redimensionne(self, largeur, hauteur):
+        """Renvoie une image en pixels aux nouvelles dimensions en réutilisant autant que possible les matrices
+        existantes : une matrice de même taille est partagée, une matrice plus courte est une vue sur l'ancienne,
+        seule une matrice plus longue est réallouée.
+
+        L'objet courant n'est pas modifié car il peut être partagé avec une copie de la zone utilisée par un
+        calcul en arrière-plan (voir Zone.copie).
+        """
+        im_pix = copy.copy(self)
+        im_pix.largeur = largeur
+        im_pix.hauteur = hauteur
+        im_pix.R = hauteur / largeur
+        if largeur <= self.mat_px.shape[1]:
+            im_pix.mat_px = self.mat_px[:, :largeur]
+        else:
+            im_pix.mat_px = np.linspace(0, largeur, num=largeur, endpoint=False)[np.newaxis]
+        if hauteur <= self.mat_py.shape[0]:
+            im_pix.mat_py = self.mat_py[:hauteur]
+        else:
+            im_pix.mat_py = np.linspace(0, hauteur, num=hauteur, endpoint=False)[:,np.newaxis]
+        return im_pix
+
 
 class Zone():
     """Classe de données géométriques modélisant une zone de représentation
@@ -76,6 +104,66 @@ class Zone():
         ya = self.A.y - Ky * pya
         self.init_bornes(xa, xb, ya)
 
+    def aligne_sur_axe(self):
+        """Décalage vertical de la zone de moins d'un quart de pixel, si elle chevauche l'axe réel, pour que
+        ses lignes de pixels soient symétriques deux à deux par rapport à cet axe (voir lignes_symetriques).
+        Utilisé par l'interface après un zoom ou un redimensionnement, le décalage étant imperceptible ; les
+        zones demandées explicitement (service de calcul, scripts) ne sont pas modifiées.
+        """
+        if self.A.y > 0 > self.B.y:
+            k = 2 * self.A.y / self.Kxy
+            if abs(k - round(k)) > 1e-9:
+                self.init_bornes(self.A.x, self.B.x, round(k) * self.Kxy / 2)
+
+    def redimensionne(self, nb_pixels_x, nb_pixels_y):
+        """Adaptation de la zone à une nouvelle taille d'image : le point A et l'échelle Kxy sont conservés,
+        la zone est donc étendue ou rognée par la droite et par le bas (comme le canevas redimensionné)
+        """
+        self.im_pix = self.im_pix.redimensionne(nb_pixels_x, nb_pixels_y)
+        self.init_bornes(self.A.x, self.A.x + self.Kxy * nb_pixels_x, self.A.y)
+
+    def lignes_symetriques(self):
+        """Détermination des lignes de pixels à calculer et des lignes pouvant être obtenues par symétrie
+        par rapport à l'axe réel.
+
+        La ligne py a pour ordonnée y = A.y - Kxy * py et sa symétrique est la ligne k - py, avec
+        k = 2 * A.y / Kxy. La symétrie n'est exploitée que si la zone chevauche l'axe réel et si k est
+        entier (aux erreurs d'arrondi près, voir aligne_sur_axe), sinon les lignes ne se correspondent
+        pas exactement et toutes sont calculées. Les lignes recopiées sont prises du côté de l'axe le
+        plus court, de sorte que les lignes calculées (la plus grande moitié et le reste asymétrique)
+        soient contiguës.
+
+        Valeur retournée : (debut, fin, lignes_miroir, lignes_sources) où [debut, fin[ est l'intervalle
+        des lignes à calculer et lignes_miroir les lignes égales aux lignes_sources prises en ordre
+        inverse (ces deux dernières valant None en l'absence de symétrie exploitable).
+        """
+        hauteur = self.im_pix.hauteur
+        if not self.A.y > 0 > self.B.y:
+            return 0, hauteur, None, None
+        k = 2 * self.A.y / self.Kxy
+        if abs(k - round(k)) > 1e-9:
+            return 0, hauteur, None, None
+        k = round(k)
+        if k < hauteur:  # axe dans la moitié haute : les lignes du haut sont les symétriques de lignes plus basses
+            nb_lignes = (k + 1) // 2
+            return nb_lignes, hauteur, slice(0, nb_lignes), slice(k - nb_lignes + 1, k + 1)
+        else:  # axe dans la moitié basse : les lignes du bas sont les symétriques de lignes plus hautes
+            fin = k // 2 + 1
+            if fin >= hauteur:
+                return 0, hauteur, None, None
+            return 0, fin, slice(fin, hauteur), slice(k - hauteur + 1, k - fin + 1)
+
+    def copie(self):
+        "Copie de la zone dont les bornes sont indépendantes, l'image en pixels (jamais modifiée en place) étant partagée"
+        zone = copy.copy(self)
+        zone.A = Point(self.A.x, self.A.y)
+        zone.B = Point(self.B.x, self.B.y)
+        return zone
+
+    def grille(self, lignes=slice(None), colonnes=slice(None)):
+        "Matrice des valeurs de c = x + iy des pixels des lignes et colonnes indiquées (tranches) de l'image (toutes par défaut)"
+        return self.pix_to_x(self.im_pix.mat_px[:, colonnes]) + 1j * self.pix_to_y(self.im_pix.mat_py[lignes])
+
     def pix_to_x(self, px):
         return self.Kxy * px + self.A.x
 
@@ -88,14 +176,52 @@ class Mandelbrot():
 
     L'ensemble est représenté sur une zone du plan et les points qui lui appartiennent
     sont déterminés à partir du calcul d'une suite de récurrence avec n_iter itérations
+
+    Le calcul d'une image de grande taille est découpé en tuiles dont le coût est estimé par une
+    passe grossière préalable (voir estimation_couts), s'il est assez long pour que le découpage
+    soit rentable. Les tuiles sont réparties entre plusieurs
+    fils d'exécution, les plus coûteuses en premier, et l'avancement du calcul ainsi que le temps
+    restant sont transmis à une éventuelle fonction de suivi. Un budget de temps peut être fixé :
+    si la durée estimée le dépasse, le calcul peut être fait automatiquement à résolution réduite.
     """
 
-    def __init__(self, nb_pixels_x, nb_pixels_y, xa, xb, ya, n_iter=100):
+    periode_retrait = 8         # nombre d'itérations entre deux retraits des suites divergentes
+    taille_tuile = 128          # côté des tuiles de calcul, en pixels
+    pixels_lot = 32768          # nombre de valeurs de c par bloc du calcul groupé de plusieurs zones (voir calcul_ensembles)
+    reduction_estimation = 8    # facteur de réduction de la résolution de la passe d'estimation du coût
+    duree_min_tuiles = 0.5      # durée estimée (en secondes) en deçà de laquelle le calcul se fait en une passe, sans tuiles
+    reduction_max = 16          # facteur maximal de réduction de la résolution en cas de dépassement du budget
+    cout_fixe_pixel = 4         # coût d'un pixel indépendant du nombre d'itérations, en équivalent itérations
+    secondes_par_unite = None   # durée d'une unité de coût, mesurée lors des calculs précédents
+    secondes_par_tour = None    # durée fixe d'un tour de la boucle d'itération d'une passe, indépendante du nombre de pixels
+    c_etalon = -0.1226 + 0.7449j  # point de l'ensemble hors des raccourcis (centre du disque de période 3), itéré n_iter fois
+    part_iterations_min = 0.1   # part minimale des itérations dans la durée mesurée d'un calcul (protection contre les mesures bruitées)
+    executeur = None            # fils d'exécution de calcul des tuiles, partagés par tous les modèles ...
+    verrou_executeur = threading.Lock()  # ... et créés au premier calcul découpé en tuiles
+
+    def __init__(self, nb_pixels_x, nb_pixels_y, xa, xb, ya, n_iter=100, budget=None, reduction_auto=False):
         self.zone = Zone(nb_pixels_x, nb_pixels_y, xa, xb, ya)
         self.n_iter = n_iter
+        self.ensemble = None
+        self.interrompu = False  # permet d'abandonner un calcul en arrière-plan devenu inutile
+        self.budget = budget                    # durée maximale souhaitée d'un calcul, en secondes
+        self.reduction_auto = reduction_auto    # réduction automatique de la résolution en cas de dépassement du budget
+        self.reduction = 1                      # facteur de réduction de la résolution du dernier calcul
+        self.progression = (0.0, None)          # avancement du calcul en cours et temps restant estimé
         np.seterr(all='ignore')
 
-    def calcul_ensemble(self):
+    def copie(self):
+        "Copie du modèle destinée à un calcul en arrière-plan, indépendante des modifications ultérieures de la zone"
+        modele = copy.copy(self)
+        modele.zone = self.zone.copie()
+        modele.interrompu = False
+        modele.progression = (0.0, None)
+        return modele
+
+    def redimensionne(self, nb_pixels_x, nb_pixels_y):
+        self.zone.redimensionne(nb_pixels_x, nb_pixels_y)
+
+    def calcul_ensemble(self, suivi=None, en_parallele=True):
         """Méthode déterminant l'ensemble de Mandelbrot pour la zone de représentation courante.
 
         Attribue un booléen à tous les pixels de l'image selon que la relation de récurrence
@@ -105,20 +231,531 @@ class Mandelbrot():
 
         Les calculs sont réalisés matriciellement grâce à Numpy, une matrice contenant les valeurs
         d'une grandeur donnée pour tous les pixels de l'image.
+
+        L'ensemble étant symétrique par rapport à l'axe réel, lorsque la zone chevauche cet axe et
+        que les lignes de pixels se correspondent exactement de part et d'autre (voir
+        Zone.lignes_symetriques), seules les lignes de la plus grande moitié sont calculées et les
+        lignes symétriques en sont recopiées.
+
+        La fonction 'suivi', si elle est fournie, est appelée avec l'avancement (de 0 à 1) et le temps
+        restant estimé (en secondes) au début du calcul et à la fin de chaque tuile, dans le fil
+        d'exécution appelant. Si la durée estimée dépasse le budget et que la réduction automatique
+        est active, l'ensemble est calculé sur un pixel sur 'reduction' dans chaque direction puis
+        agrandi. Si 'en_parallele' est faux, les tuiles sont calculées dans le fil d'exécution appelant,
+        sans créer les fils d'exécution partagés (premier tracé au lancement de l'application).
+        """
+        debut, fin, lignes_miroir, lignes_sources = self.zone.lignes_symetriques()
+        hauteur, largeur = self.zone.im_pix.hauteur, self.zone.im_pix.largeur
+        tuiles = [(l, min(l + Mandelbrot.taille_tuile, fin), c, min(c + Mandelbrot.taille_tuile, largeur))
+                  for l in range(debut, fin, Mandelbrot.taille_tuile) for c in range(0, largeur, Mandelbrot.taille_tuile)]
+        self.reduction = 1
+        # Tuile unique sans budget : calcul direct, sans estimation
+        if len(tuiles) == 1 and self.budget is None:
+            self.signale(suivi, 0.0, None)
+            ensemble = self.calcul_lignes(debut, fin)
+        else:
+            couts, tours = self.estimation_couts(debut, tuiles)
+            duree_estimee = self.duree_estimee(sum(couts), sum(tours))
+            if self.budget is not None and duree_estimee > self.budget and self.reduction_auto:
+                self.reduction = self.reduction_budget(sum(couts), max(tours))
+                self.signale(suivi, 0.0, self.duree_estimee(sum(couts) / self.reduction**2, max(tours)))
+                ensemble = self.calcul_reduit(self.reduction)
+                lignes_miroir = None
+            elif duree_estimee < Mandelbrot.duree_min_tuiles:
+                # Calcul court : une seule passe évite de payer le coût fixe des tours de boucle pour chaque tuile
+                self.signale(suivi, 0.0, self.duree_estimee(sum(couts), max(tours)))
+                ensemble = self.calcul_lignes(debut, fin)
+            else:
+                self.signale(suivi, 0.0, duree_estimee)
+                ensemble = self.calcul_tuiles(tuiles, couts, tours, suivi, en_parallele)
+        if ensemble is None:  # calcul interrompu
+            return
+        if lignes_miroir is not None:
+            ensemble[lignes_miroir] = ensemble[lignes_sources][::-1]
+        self.signale(suivi, 1.0, 0.0)
+        self.ensemble = ensemble
+
+    def calcul_lignes(self, debut, fin):
+        "Calcul en une passe des lignes [debut, fin[ de l'ensemble ; renvoie None si le calcul a été interrompu"
+        bornee = self.suite_bornee(self.zone.grille(slice(debut, fin)))
+        if bornee is None:
+            return None
+        ensemble = np.empty((self.zone.im_pix.hauteur, self.zone.im_pix.largeur), dtype=bool)
+        ensemble[debut:fin] = bornee
+        return ensemble
+
+    def signale(self, suivi, avancement, restant):
+        "Mémorisation de l'avancement du calcul (pour les calculs en arrière-plan) et appel de la fonction de suivi"
+        self.progression = (avancement, restant)
+        if suivi is not None:
+            suivi(avancement, restant)
+
+    def duree_estimee(self, cout, tours):
+        """Durée estimée d'un calcul de coût total 'cout' nécessitant au total 'tours' tours de boucle d'itération
+        (somme sur les passes, une par tuile) : coût des itérations des pixels et coût fixe des tours de boucle.
+        Ce dernier n'est pas réparti entre les fils d'exécution, le verrou global de l'interpréteur étant conservé
+        hors des calculs Numpy.
+        """
+        return cout * Mandelbrot.secondes_par_unite + tours * Mandelbrot.secondes_par_tour
+
+    def reduction_budget(self, cout, tours):
+        """Facteur de réduction de la résolution nécessaire pour que le calcul en une passe de 'tours' tours de boucle
+        (voir calcul_reduit) tienne dans le budget"""
+        hauteur, largeur = self.zone.im_pix.hauteur, self.zone.im_pix.largeur
+        reduction_max = min(Mandelbrot.reduction_max, hauteur, largeur)
+        duree_iterations = cout * Mandelbrot.secondes_par_unite
+        budget_iterations = self.budget - tours * Mandelbrot.secondes_par_tour
+        if duree_iterations <= budget_iterations:
+            return 1
+        if budget_iterations <= 0:
+            return reduction_max
+        return min(ceil(sqrt(duree_iterations / budget_iterations)), reduction_max)
+
+    def estimation_couts(self, debut, tuiles):
+        """Estimation du coût de calcul de chaque tuile (en nombre d'itérations) et de son nombre de tours de boucle
+        (nombre maximal d'itérations de ses pixels) à partir d'une passe grossière sur un pixel sur
+        'reduction_estimation' dans chaque direction. Renvoie la liste des coûts et celle des tours.
+
+        Si aucun calcul n'a encore été mesuré, la durée d'une unité de coût est calibrée par la durée de cette
+        passe, déduction faite de celle des tours de boucle, mesurée sur une passe d'un seul pixel itéré n_iter
+        fois : sur une passe grossière, ces derniers représentent l'essentiel de la durée.
         """
-        c = self.zone.pix_to_x(self.zone.im_pix.mat_px) + 1j * self.zone.pix_to_y(self.zone.im_pix.mat_py)
-        z = np.zeros((self.zone.im_pix.hauteur, self.zone.im_pix.largeur), dtype=complex)
+        f = Mandelbrot.reduction_estimation
+        fin = max(t[1] for t in tuiles)
+        if Mandelbrot.secondes_par_tour is None:
+            instant = time.perf_counter()
+            self.nb_iterations(np.array([Mandelbrot.c_etalon]))
+            Mandelbrot.secondes_par_tour = (time.perf_counter() - instant) / max(self.n_iter, 1)
+        instant = time.perf_counter()
+        iterations = self.nb_iterations(self.zone.grille(slice(debut + f//2, fin, f), slice(f//2, None, f)))
+        duree = time.perf_counter() - instant
+        couts, tours = [], []
+        for l0, l1, c0, c1 in tuiles:
+            grossier = iterations[(l0 - debut) // f : -(-(l1 - debut) // f), c0 // f : -(-c1 // f)]
+            couts.append(f * f * grossier.sum() + Mandelbrot.cout_fixe_pixel * (l1 - l0) * (c1 - c0))
+            tours.append(grossier.max(initial=0))
+        if Mandelbrot.secondes_par_unite is None:
+            duree_iterations = max(duree - iterations.max(initial=0) * Mandelbrot.secondes_par_tour, Mandelbrot.part_iterations_min * duree)
+            Mandelbrot.secondes_par_unite = duree_iterations / (iterations.sum() + Mandelbrot.cout_fixe_pixel * iterations.size + 1)
+        return couts, tours
+
+    def calcul_tuiles(self, tuiles, couts, tours, suivi, en_parallele=True):
+        """Calcul des tuiles par les fils d'exécution partagés (ou dans le fil appelant si 'en_parallele' est
+        faux), les plus coûteuses en premier pour équilibrer la charge, avec suivi de l'avancement pondéré par
+        les coûts estimés. La durée d'une unité de coût est recalibrée à la fin du calcul, déduction faite de
+        la durée fixe des tours de boucle de chaque tuile. Renvoie l'ensemble, ou None si le calcul a été
+        interrompu.
+        """
+        ensemble = np.empty((self.zone.im_pix.hauteur, self.zone.im_pix.largeur), dtype=bool)
+        ordre = sorted(range(len(tuiles)), key=lambda i: couts[i], reverse=True)
+        cout_total, cout_fait = sum(couts), 0
+        instant = time.perf_counter()
+        if en_parallele:
+            from concurrent.futures import ThreadPoolExecutor, as_completed
+            with Mandelbrot.verrou_executeur:
+                if Mandelbrot.executeur is None:
+                    Mandelbrot.executeur = ThreadPoolExecutor(os.cpu_count())
+                futurs = {Mandelbrot.executeur.submit(self.calcul_tuile, ensemble, tuiles[i]): couts[i] for i in ordre}
+            termines = ((not futur.cancelled() and futur.result(), futurs[futur]) for futur in as_completed(futurs))
+        else:
+            termines = ((self.calcul_tuile(ensemble, tuiles[i]), couts[i]) for i in ordre)
+        for complete, cout in termines:
+            if not complete:  # calcul interrompu ou tuile annulée (voir arrete_executeur)
+                return None
+            cout_fait += cout
+            ecoule = time.perf_counter() - instant
+            self.signale(suivi, cout_fait / cout_total, ecoule * (cout_total - cout_fait) / cout_fait)
+        duree_iterations = time.perf_counter() - instant - sum(tours) * Mandelbrot.secondes_par_tour
+        Mandelbrot.secondes_par_unite = max(duree_iterations, Mandelbrot.part_iterations_min * (time.perf_counter() - instant)) / cout_total
+        return ensemble
+
+    @staticmethod
+    def arrete_executeur():
+        "Arrêt des fils d'exécution partagés, les tuiles en attente étant annulées (fermeture de l'application)"
+        with Mandelbrot.verrou_executeur:
+            if Mandelbrot.executeur is not None:
+                Mandelbrot.executeur.shutdown(wait=False, cancel_futures=True)
+                Mandelbrot.executeur = None
+
+    def calcul_tuile(self, ensemble, tuile):
+        "Calcul d'une tuile (lignes [l0, l1[, colonnes [c0, c1[) de l'ensemble ; renvoie False si le calcul a été interrompu"
+        l0, l1, c0, c1 = tuile
+        bornee = self.suite_bornee(self.zone.grille(slice(l0, l1), slice(c0, c1)))
+        if bornee is None:
+            return False
+        ensemble[l0:l1, c0:c1] = bornee
+        return True
+
+    def calcul_reduit(self, reduction):
+        "Calcul de l'ensemble sur un pixel sur 'reduction' dans chaque direction, chaque pixel calculé étant dupliqué sur ses voisins"
+        milieu = slice(reduction // 2, None, reduction)
+        bornee = self.suite_bornee(self.zone.grille(milieu, milieu))
+        if bornee is None:
+            return None
+        lignes = np.minimum(np.arange(self.zone.im_pix.hauteur) // reduction, bornee.shape[0] - 1)
+        colonnes = np.minimum(np.arange(self.zone.im_pix.largeur) // reduction, bornee.shape[1] - 1)
+        return bornee[np.ix_(lignes, colonnes)]
+
+    def calcul_ensembles(self, zones):
+        """Méthode déterminant l'ensemble de Mandelbrot sur plusieurs zones (de dimensions quelconques) par
+        passes matricielles communes : les valeurs de c de toutes les zones sont mises bout à bout et la suite
+        est calculée par blocs de 'pixels_lot' valeurs, assez grands pour amortir le coût fixe de chaque
+        itération et assez petits pour que les matrices restent dans le cache du processeur (un seul bloc
+        pour toutes les zones est plus lent qu'un calcul par zone). Renvoie la liste des ensembles, ou None si
+        le calcul a été interrompu.
+        """
+        grilles = [zone.grille() for zone in zones]
+        c = np.concatenate([grille.ravel() for grille in grilles])
+        blocs = [self.suite_bornee(c[debut:debut + Mandelbrot.pixels_lot]) for debut in range(0, c.size, Mandelbrot.pixels_lot)]
+        if any(bloc is None for bloc in blocs):
+            return None
+        bornee = np.concatenate(blocs)
+        limites = np.cumsum([grille.size for grille in grilles])[:-1]
+        return [morceau.reshape(grille.shape) for morceau, grille in zip(np.split(bornee, limites), grilles)]
+
+    def suite_bornee(self, c):
+        """Méthode de calcul matriciel de la suite de récurrence pour une matrice de valeurs de c.
+        Renvoie la matrice des booléens de convergence, ou None si le calcul a été interrompu.
+
+        Le calcul utilise deux raccourcis sans effet sur le résultat :
+        - les valeurs de c dont on sait qu'elles appartiennent à l'ensemble (voir Mandelbrot.interieur)
+          ou qu'elles n'y appartiennent pas (module supérieur à 2) ne sont pas itérées
+        - les suites ayant divergé (module supérieur à 2) sont retirées du calcul toutes les
+          'periode_retrait' itérations, ce qui réduit la taille des matrices au fil des itérations,
+          et la boucle s'arrête dès qu'il ne reste plus de suite à itérer
+        """
+        c_plat = np.ravel(c)
+        interieur = Mandelbrot.interieur(c_plat)
+        bornee = interieur.copy()
+        actifs = np.flatnonzero(~interieur & (np.abs(c_plat) <= 2))
+        c_actifs = c_plat[actifs]
+        z = np.zeros(c_actifs.shape, dtype=complex)
+        for n in range(self.n_iter):
+            if self.interrompu:
+                return None
+            np.multiply(z, z, out=z)  # z = z*z + c sans matrice intermédiaire
+            z += c_actifs
+            if n % Mandelbrot.periode_retrait == Mandelbrot.periode_retrait - 1:
+                restants = z.real * z.real + z.imag * z.imag <= 4
+                actifs, c_actifs, z = actifs[restants], c_actifs[restants], z[restants]
+                if actifs.size == 0:
+                    break
+        bornee[actifs] = np.abs(z) < 2
+        return bornee.reshape(np.shape(c))
+
+    def nb_iterations(self, c):
+        "Nombre d'itérations effectuées par la méthode suite_bornee pour chaque valeur de c, c'est-à-dire son coût de calcul"
+        c_plat = np.ravel(c)
+        iterations = np.zeros(c_plat.size)
+        actifs = np.flatnonzero(~Mandelbrot.interieur(c_plat) & (np.abs(c_plat) <= 2))
+        c_actifs = c_plat[actifs]
+        z = np.zeros(c_actifs.shape, dtype=complex)
         for n in range(self.n_iter):
+            np.multiply(z, z, out=z)
+            z += c_actifs
+            if n % Mandelbrot.periode_retrait == Mandelbrot.periode_retrait - 1:
+                iterations[actifs] = n + 1
+                restants = z.real * z.real + z.imag * z.imag <= 4
+                actifs, c_actifs, z = actifs[restants], c_actifs[restants], z[restants]
+                if actifs.size == 0:
+                    break
+        iterations[actifs] = self.n_iter
+        return iterations.reshape(np.shape(c))
+
+    @staticmethod
+    def interieur(c):
+        "Test d'appartenance de c à la cardioïde principale ou au disque de période 2, tous deux inclus dans l'ensemble"
+        x, y2 = c.real, c.imag**2
+        q = (x - 0.25)**2 + y2
+        return (q * (q + (x - 0.25)) < 0.25 * y2) | ((x + 1)**2 + y2 < 0.0625)
+
+    def apercu(self, pxa, pya, echelle, largeur, hauteur):
+        """Méthode de rééchantillonnage immédiat (au plus proche voisin) de l'ensemble courant.
+
+        Le pixel (px, py) de l'aperçu, de dimensions largeur x hauteur, correspond au pixel
+        (pxa + echelle * px, pya + echelle * py) de l'ensemble courant : un zoom de cadre (pxa, pxb, pya, pyb)
+        s'obtient avec echelle = (pxb - pxa) / largeur, un redimensionnement avec pxa = pya = 0 et echelle = 1.
+        Les pixels tombant en dehors de l'ensemble courant sont considérés comme divergents, en attendant
+        le calcul exact.
+        """
+        hauteur_ens, largeur_ens = self.ensemble.shape
+        ix = np.floor(pxa + echelle * (np.arange(largeur) + 0.5)).astype(int)
+        iy = np.floor(pya + echelle * (np.arange(hauteur) + 0.5)).astype(int)
+        dans_x = (ix >= 0) & (ix < largeur_ens)
+        dans_y = (iy >= 0) & (iy < hauteur_ens)
+        apercu = np.zeros((hauteur, largeur), dtype=bool)
+        apercu[np.ix_(dans_y, dans_x)] = self.ensemble[np.ix_(iy[dans_y], ix[dans_x])]
+        return apercu
+
+
+class EstimationAire():
+    """Classe d'estimation de Monte-Carlo de l'aire de l'ensemble de Mandelbrot dans la zone d'un modèle.
+
+    L'estimation est faite par lots d'échantillons stratifiés : la zone est découpée en strates
+    rectangulaires et chaque lot tire une valeur de c uniformément dans chaque strate. Chaque lot
+    fournit ainsi une estimation sans biais de l'aire (à n_iter itérations), de variance plus faible
+    qu'avec un tirage uniforme ; les lots étant indépendants, l'intervalle de confiance à 95 % de
+    leur moyenne se déduit de leur écart-type.
+
+    L'intervalle de confiance ne tient pas compte du biais de troncature : les points qui s'échappent
+    après n_iter itérations sont comptés dans l'ensemble, ce qui surestime l'aire (d'environ 0.04 à
+    100 itérations et de l'ordre de 0.001 à 10000 itérations pour l'ensemble complet).
+
+    Le test de convergence est celui du modèle (Mandelbrot.suite_bornee, avec ses raccourcis) et les
+    lots sont répartis sur plusieurs processus.
+    """
+
+    nb_min_lots = 10    # nombre minimal de lots avant de tester la précision atteinte
+    quantile = 1.96     # quantile de la loi normale pour un intervalle de confiance à 95 %
+
+    def __init__(self, modele, nb_strates_x=100, nb_processus=None, graine=None):
+        self.modele = modele
+        self.nb_strates_x = nb_strates_x
+        self.nb_strates_y = max(1, round(nb_strates_x * modele.zone.im_pix.R))
+        self.nb_processus = nb_processus or os.cpu_count()
+        self.graines = np.random.SeedSequence(graine)
+        # Sommes des estimations par lot et de leurs carrés
+        self.nb_lots = 0
+        self.somme = 0.0
+        self.somme_carres = 0.0
+
+    def estimations(self, precision=None, nb_max_lots=None):
+        """Générateur des estimations successives (aire, demi-largeur de l'intervalle de confiance, nombre
+        d'échantillons), une par lot, jusqu'à ce que la demi-largeur soit inférieure à 'precision' ou que
+        'nb_max_lots' lots aient été calculés (indéfiniment si ces deux paramètres sont absents).
+        Plusieurs lots sont calculés en parallèle en permanence.
+        """
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        # Processus lancés par "spawn" : "fork" peut bloquer dans un processus comportant déjà des fils d'exécution
+        executeur = ProcessPoolExecutor(self.nb_processus, mp_context=multiprocessing.get_context("spawn"))
+        try:
+            en_vol = deque(self.soumet_lot(executeur) for _ in range(2 * self.nb_processus))
+            while True:
+                self.ajoute_lot(en_vol.popleft().result())
+                aire, demi_largeur = self.estimation()
+                yield aire, demi_largeur, self.nb_lots * self.nb_strates_x * self.nb_strates_y
+                if nb_max_lots is not None and self.nb_lots >= nb_max_lots:
+                    break
+                if precision is not None and self.nb_lots >= EstimationAire.nb_min_lots and demi_largeur <= precision:
+                    break
+                en_vol.append(self.soumet_lot(executeur))
+        finally:
+            executeur.shutdown(cancel_futures=True)
+
+    def soumet_lot(self, executeur):
+        return executeur.submit(lot_aire, self.modele, self.nb_strates_x, self.nb_strates_y, self.graines.spawn(1)[0])
+
+    def ajoute_lot(self, aire):
+        self.nb_lots += 1
+        self.somme += aire
+        self.somme_carres += aire * aire
+
+    def estimation(self):
+        "Moyenne des estimations des lots et demi-largeur de son intervalle de confiance"
+        moyenne = self.somme / self.nb_lots
+        if self.nb_lots < 2:
+            return moyenne, float("inf")
+        variance = max(0.0, (self.somme_carres - self.nb_lots * moyenne**2) / (self.nb_lots - 1))
+        return moyenne, EstimationAire.quantile * sqrt(variance / self.nb_lots)
+
+
+def lot_aire(modele, nb_strates_x, nb_strates_y, graine):
+    """Estimation de l'aire de l'ensemble dans la zone du modèle par un lot d'échantillons stratifiés
+    (une valeur de c tirée uniformément dans chacune des nb_strates_x x nb_strates_y strates).
+    Fonction de module pour pouvoir être exécutée dans un autre processus.
+    """
+    generateur = np.random.default_rng(graine)
+    A, B = modele.zone.A, modele.zone.B
+    x = A.x + (np.arange(nb_strates_x) + generateur.random((nb_strates_y, nb_strates_x))) * (B.x - A.x) / nb_strates_x
+    y = A.y + (np.arange(nb_strates_y)[:, np.newaxis] + generateur.random((nb_strates_y, nb_strates_x))) * (B.y - A.y) / nb_strates_y
+    return modele.suite_bornee(x + 1j * y).mean() * (B.x - A.x) * (A.y - B.y)
+
+
+class MandelbrotDistant(Mandelbrot):
+    """Classe modélisant l'ensemble de Mandelbrot dont le calcul est délégué à un service local.
+
+    Le service (voir service_Mandelbrot.py) est partagé entre plusieurs clients qui bénéficient
+    ainsi de son cache et de ses travailleurs. Seule la méthode de calcul diffère du modèle local :
+    l'ensemble est demandé par HTTP et reçu sous forme d'un tampon d'un bit par pixel. Si le service
+    ne répond pas dans le délai imparti ou renvoie une erreur, l'ensemble est calculé localement.
+
+    Le délai d'attente croît avec la taille de la demande (voir delai_attente), pour qu'un calcul long
+    mais normal du service ne soit pas abandonné puis refait localement.
+    """
+
+    delai_reponse = 10              # durée minimale d'attente de la réponse du service, en secondes ...
+    secondes_par_iteration = 2e-8   # ... augmentée de cette durée par pixel et par itération (cas le plus lent, avec marge)
+
+    def __init__(self, url, nb_pixels_x, nb_pixels_y, xa, xb, ya, n_iter=100):
+        Mandelbrot.__init__(self, nb_pixels_x, nb_pixels_y, xa, xb, ya, n_iter)
+        self.url = url.rstrip("/")
+
+    def calcul_ensemble(self, suivi=None, en_parallele=True):
+        import json, urllib.request  # importés seulement en cas d'utilisation du service (durée du lancement)
+        largeur, hauteur = self.zone.im_pix.largeur, self.zone.im_pix.hauteur
+        demande = {"xa": self.zone.A.x, "xb": self.zone.B.x, "ya": self.zone.A.y,
+                   "largeur": largeur, "hauteur": hauteur, "n_iter": self.n_iter, "format": "bits"}
+        requete = urllib.request.Request(self.url + "/rendu", data=json.dumps(demande).encode(),
+                                         headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(requete, timeout=self.delai_attente()) as reponse:
+                donnees = reponse.read()
+            if len(donnees) != -(-largeur * hauteur // 8):
+                raise ValueError(f"réponse de {len(donnees)} octets")
+            bits = np.unpackbits(np.frombuffer(donnees, dtype=np.uint8), count=largeur*hauteur)
+        except (OSError, ValueError) as erreur:  # service injoignable, délai dépassé, erreur HTTP ou réponse tronquée
+            print(f"Service de calcul indisponible ({erreur}) : calcul local")
+            Mandelbrot.calcul_ensemble(self, suivi, en_parallele)
+            return
+        if self.interrompu:
+            return
+        self.ensemble = bits.reshape(hauteur, largeur).astype(bool)
+
+    def delai_attente(self):
+        """Délai d'attente de la réponse du service, majorant la durée de son calcul : tous les pixels itérés
+        n_iter fois, sans raccourci ni parallélisme
+        """
+        nb_pixels = self.zone.im_pix.largeur * self.zone.im_pix.hauteur
+        return MandelbrotDistant.delai_reponse + nb_pixels * self.n_iter * MandelbrotDistant.secondes_par_iteration
+
+
+class Buddhabrot():
+    """Classe modélisant la densité des orbites divergentes (« Buddhabrot ») sur une zone de représentation.
+
+    Des valeurs de c sont tirées aléatoirement par lots dans le domaine [-2, 2] x [-2, 2] et la suite de
+    récurrence est calculée matriciellement pour chaque lot. Les termes des suites qui divergent sont
+    accumulés dans un histogramme de la taille de l'image : le calcul peut ainsi se poursuivre
+    indéfiniment avec une mémoire bornée (histogramme et lot de taille fixe).
+
+    Le tirage est préférentiel : le domaine est découpé en cellules dont on calcule l'appartenance à
+    l'ensemble de Mandelbrot (méthode calcul_ensemble sur une grille grossière). Les cellules
+    intérieures, dont les suites ne divergent pas, ne sont jamais tirées (rejet anticipé sans calcul) ;
+    les cellules proches de la frontière, dont les orbites sont longues, le sont plus souvent que les
+    autres. Chaque orbite est pondérée par l'inverse de sa probabilité relative de tirage pour que la
+    densité obtenue corresponde à celle d'un tirage uniforme. Les probabilités de tirage ne dépendant
+    que de n_iter, elles sont calculées une seule fois par nombre d'itérations.
+
+    Le rejet laisse un léger biais : l'appartenance d'une cellule est celle de son coin, si bien que
+    quelques valeurs de c des cellules rejetées divergent (environ 0,04 % à 100 itérations). Leurs
+    orbites manquent à la densité, soit environ 0,03 % des termes d'orbites à 100 itérations et 0,1 %
+    à 1000 itérations, bien en deçà des fluctuations du tirage aléatoire.
+    """
+
+    taille_grille = 256             # nombre de cellules de la grille grossière dans chaque direction
+    poids_frontiere = 1.0           # poids de tirage des cellules proches de la frontière ...
+    poids_exterieur = 0.1           # ... et des autres cellules extérieures
+    taille_tampon = 1_000_000       # nombre de termes d'orbites accumulés avant mise à jour de l'histogramme
+    tirages = {}                    # probabilités de tirage (cumul_poids, ponderation) par nombre d'itérations
+
+    def __init__(self, zone, n_iter, taille_lot=20000, graine=None):
+        self.zone = zone.copie()
+        self.n_iter = n_iter
+        self.taille_lot = taille_lot
+        self.histogramme = np.zeros(self.zone.im_pix.hauteur * self.zone.im_pix.largeur)
+        self.nb_echantillons = 0
+        self.generateur = np.random.default_rng(graine)
+        self.prepare_tirage()
+
+    def prepare_tirage(self):
+        "Récupération des probabilités de tirage pour le nombre d'itérations du modèle, calculées au premier appel"
+        if self.n_iter not in Buddhabrot.tirages:
+            Buddhabrot.tirages[self.n_iter] = Buddhabrot.calcul_tirage(self.n_iter)
+        self.cumul_poids, self.ponderation = Buddhabrot.tirages[self.n_iter]
+        self.cote_cellule = 4.0 / Buddhabrot.taille_grille
+
+    @staticmethod
+    def calcul_tirage(n_iter):
+        "Calcul des probabilités de tirage de chaque cellule de la grille grossière à partir de son appartenance à l'ensemble"
+        grille = Mandelbrot(Buddhabrot.taille_grille, Buddhabrot.taille_grille, -2.0, 2.0, 2.0, n_iter)
+        grille.calcul_ensemble()
+        dedans = np.pad(grille.ensemble, 1)
+        voisins = [np.roll(np.roll(dedans, dy, axis=0), dx, axis=1)[1:-1, 1:-1] for dy in (-1, 0, 1) for dx in (-1, 0, 1)]
+        interieur = np.logical_and.reduce(voisins)   # cellule et ses voisines dans l'ensemble : rejetée
+        frontiere = np.logical_or.reduce(voisins)    # au moins une voisine dans l'ensemble
+        poids = np.where(frontiere, Buddhabrot.poids_frontiere, Buddhabrot.poids_exterieur)
+        poids[interieur] = 0
+        cumul_poids = np.cumsum(poids.ravel())
+        # Pondération d'une orbite : rapport entre les probabilités de tirage uniforme et préférentiel de sa cellule
+        ponderation = cumul_poids[-1] / (poids.size * np.where(poids > 0, poids, 1).ravel())
+        return cumul_poids, ponderation
+
+    def echantillonne(self):
+        "Tirage préférentiel d'un lot de valeurs de c et de leurs pondérations"
+        cellules = np.searchsorted(self.cumul_poids, self.generateur.random(self.taille_lot) * self.cumul_poids[-1], side="right")
+        cellules = np.minimum(cellules, self.cumul_poids.size - 1)
+        ligne, colonne = np.divmod(cellules, Buddhabrot.taille_grille)
+        x = -2.0 + (colonne + self.generateur.random(self.taille_lot)) * self.cote_cellule
+        y = 2.0 - (ligne + self.generateur.random(self.taille_lot)) * self.cote_cellule
+        return x + 1j * y, self.ponderation[cellules]
+
+    def calcul_lot(self):
+        """Traitement d'un lot : une première passe détermine les valeurs de c dont la suite diverge, une
+        seconde recalcule leurs orbites et accumule leurs termes situés dans la zone. Dans les deux passes,
+        les suites ayant divergé sont retirées des matrices de calcul au fur et à mesure.
+        """
+        c, ponderation = self.echantillonne()
+        # Première passe : suites divergentes
+        z = np.zeros_like(c)
+        actifs = np.arange(c.size)
+        diverge = np.zeros(c.size, dtype=bool)
+        for n in range(self.n_iter):
+            z = z*z + c[actifs]
+            sortis = np.abs(z) > 2
+            diverge[actifs[sortis]] = True
+            actifs, z = actifs[~sortis], z[~sortis]
+            if actifs.size == 0:
+                break
+        # Seconde passe : accumulation des orbites divergentes
+        c, ponderation = c[diverge], ponderation[diverge]
+        z = np.zeros_like(c)
+        indices, poids, taille = [], [], 0
+        largeur, hauteur = self.zone.im_pix.largeur, self.zone.im_pix.hauteur
+        while c.size > 0:
             z = z*z + c
-        self.ensemble = np.abs(z) < 2
+            px = np.floor((z.real - self.zone.A.x) / self.zone.Kxy)
+            py = np.floor((self.zone.A.y - z.imag) / self.zone.Kxy)
+            dans_zone = (px >= 0) & (px < largeur) & (py >= 0) & (py < hauteur)
+            indices.append((py[dans_zone] * largeur + px[dans_zone]).astype(np.intp))
+            poids.append(ponderation[dans_zone])
+            taille += indices[-1].size
+            if taille > Buddhabrot.taille_tampon:
+                self.accumule(indices, poids)
+                indices, poids, taille = [], [], 0
+            restants = np.abs(z) <= 2
+            c, z, ponderation = c[restants], z[restants], ponderation[restants]
+        self.accumule(indices, poids)
+        self.nb_echantillons += self.taille_lot
+
+    def accumule(self, indices, poids):
+        if indices:
+            self.histogramme += np.bincount(np.concatenate(indices), np.concatenate(poids), minlength=self.histogramme.size)
+
+    def image(self):
+        "Image en niveaux de gris (0 à 255) de la densité, avec compression par racine carrée pour faire ressortir les zones peu denses"
+        maximum = self.histogramme.max()
+        niveaux = np.zeros(self.histogramme.size) if maximum == 0 else np.sqrt(self.histogramme / maximum) * 255
+        return niveaux.astype(np.uint8).reshape(self.zone.im_pix.hauteur, self.zone.im_pix.largeur)
 
 
 #---------------------------------------- Vues ----------------------------------------#
 
+def image_pgm(niveaux):
+    "Conversion d'une matrice de niveaux de gris (entiers de 0 à 255) au format PGM binaire, lisible par PhotoImage"
+    hauteur, largeur = niveaux.shape
+    return f"P5 {largeur} {hauteur} 255 ".encode() + niveaux.astype(np.uint8).tobytes()
+
+def ensemble_pgm(donnees_pgm):
+    "Ensemble de Mandelbrot (pixels noirs) d'une image au format PGM produite par image_pgm"
+    _, largeur, hauteur, _, pixels = donnees_pgm.split(b" ", 4)
+    return (np.frombuffer(pixels, dtype=np.uint8) == 0).reshape(int(hauteur), int(largeur))
+
+
 class CanvasMandel(Canvas):
     """Widget de type Canvas spécialisé pour représenter l'ensemble de Mandelbrot.
 
-    Le widget possède principalement deux méthodes de tracé d'un tel ensemble.
+    Le widget possède une méthode de tracé d'un tel ensemble sous la forme d'une image, remplacée en place
+    à chaque tracé, et une méthode de tracé de la densité des orbites du mode Buddhabrot.
     Il possède également des méthodes servant de callbacks liées à différents événements
     se produisant sur lui :
     - callbacks liées au déplacement de la souris bouton non appuyé (entrée, sortie, survol),
@@ -130,10 +767,14 @@ class CanvasMandel(Canvas):
     - callback liée à la combinaison de touches "Control-z" permettant de revenir à la zone
       de représentation précédente (le widget stocke les coordonnées en pixels des cadres de
       zoom successifs pour cela)
+    - callback liée à la molette de la souris, zoomant ou dézoomant autour du pointeur (le zoom est
+      stocké sous la forme d'un cadre de zoom équivalent pour rester compatible avec le retour en arrière)
+    - callback liée au redimensionnement du canevas (qui suit celui de la fenêtre)
     """
 
     etiquette_efface = "items_a_effacer"
     etiquette_garde = "items_a_garder"
+    facteur_molette = 1.25  # facteur de zoom par cran de molette
 
     def __init__(self, parent, largeur, hauteur):
         # Classe et widget parents
@@ -145,6 +786,10 @@ class CanvasMandel(Canvas):
         self.K = hauteur / largeur  # idem que dans l'objet zone de la classe Mandelbrot
         # Stockage des bornes de zoom en pixels pour le retour en arrière par ctrl-z
         self.stockage_bornes = []
+        # Image de l'ensemble ou de la densité des orbites (mode Buddhabrot), mise à jour en place
+        self.item_image = None
+        self.image = None
+        self.densite_affichee = False
         # Variables d'état
         self.souris_dedans = False  # souris dans le canevas ou non
         self.zoom = False  # on est en train de dessiner un cadre de zoom ou non
@@ -155,6 +800,10 @@ class CanvasMandel(Canvas):
         self.bind("<Button-1>", self.clic)
         self.bind("<Button1-Motion>", self.deplace)
         self.bind("<Button1-ButtonRelease>", self.relache)
+        self.bind("<MouseWheel>", self.molette)  # Windows et macOS
+        self.bind("<Button-4>", self.molette)    # X11 : molette vers l'avant
+        self.bind("<Button-5>", self.molette)    # X11 : molette vers l'arrière
+        self.bind("<Configure>", self.redimensionne)
         self.parent.bind("<Control-z>", self.retour)
 
     def ajoute_bornes(self, bornes):
@@ -166,6 +815,7 @@ class CanvasMandel(Canvas):
     def entree_canevas(self, event):
         "Callback d'entrée de la souris dans le canevas, mise à jour de l'état"
         self.souris_dedans = True
+        self.parent.enregistre("entree")
 
     def survol_canevas(self, event):
         """Callback liée à l'événement de survol du canevas par la souris et conduisant à l'affichage
@@ -174,7 +824,8 @@ class CanvasMandel(Canvas):
         """
         # Stockage de la position de la souris en pixels pour affichage immédiat de la position réelle ...
         self.dernier_x, self.dernier_y = event.x, event.y # ... en cas de dezoom et absence de mouvement de la souris
-        # Appel de la méthode associée du contrôleur
+        # Appel des méthodes associées du contrôleur
+        self.parent.enregistre("survol", x=event.x, y=event.y)
         self.parent.affiche_coordonnees_souris(event.x, event.y)
 
     def sortie_canevas(self, event):
@@ -182,6 +833,7 @@ class CanvasMandel(Canvas):
         réelles du point qu'elle désigne (valable lorsque l'on n'est pas en train de zoomer).
         """
         self.souris_dedans = False
+        self.parent.enregistre("sortie")
         if not self.zoom:
             self.parent.efface_coordonnees_souris()
 
@@ -223,7 +875,8 @@ class CanvasMandel(Canvas):
             pxb, pyb = (max(self.px1, self.px2), max(self.py1, self.py2))  # B (point bas droit) a les plus grandes valeurs en pixel
             # Ajout des bornes de zoom au stockage
             self.ajoute_bornes((pxa, pxb, pya, pyb))
-            # Appel à la méthode de zoom du parent
+            # Appel aux méthodes d'enregistrement et de zoom du parent
+            self.parent.enregistre("zoom", bornes=[pxa, pxb, pya, pyb])
             self.parent.zoom_dezoom((pxa, pxb, pya), 1)
         else:  # cadre d'un seul pixel (on n'a pas déplacé la souris ou on est revenu sur le pixel de départ)
             print("Cadre de zoom réduit à un pixel, impossible de zoomer")
@@ -231,41 +884,83 @@ class CanvasMandel(Canvas):
 
     def retour(self, event):
         "Callback permettant de revenir à la zone de représentation précédente"
+        self.parent.enregistre("retour")
         try:
             bornes = self.retire_bornes()
             self.parent.zoom_dezoom(bornes, 2)
         except IndexError:
             print("Pas de dézoom possible")
 
-    def trace_ensemble(self, ensemble):
-        """Méthode de tracé effectif de l'ensemble de Mandelbrot.
-        
-        Méthode améliorée de tracé de l'ensemble : tracé ligne par ligne du canevas avec, pour chaque
-        ligne, détermination des pixels contigus qui appartiennent à l'ensemble. Ils sont alors tracés
-        d'une traite.
-
-        Il n'est paradoxalement pas plus efficace d'appliquer le même traitement aux points contigus qui
-        divergent (les blancs) qu'aux points contigus qui convergent (les noirs) car cela ajoute un test
-        supplémentaire par tour de boucle pour décider s'il faut faire un tracé ou pas.
-        """
-        for py in range(self.hauteur):
-            # Parcours d'une ligne donnée
-            px = 0
-            while px < self.largeur:
-                nb_points = 1  # à la fois nombre de points contigus et incrément de la boucle
-                if ensemble[py][px] == True:  # le pixel courant correspond à un point de l'ensemble de Mandelbrot
-                    while px+nb_points < self.largeur and ensemble[py][px+nb_points] == True:  # on vérifie si les pixels situés après en font également partie
-                        nb_points += 1  # et on compte leur nombre total
-                    self.create_line(px, py, px+nb_points, py, tags=CanvasMandel.etiquette_efface)  # on trace une ligne noire pour tous les pixels concernés                    
-                    nb_points += 1  # on a quitté la boucle précédente parce que le pixel suivant ne faisait pas partie de l'ensemble, inutile d'aller l'examiner (ou alors parce qu'on a atteint la fin de la ligne, mais alors cette affectation n'a pas d'effet)
-                px += nb_points  # on se déplace du nombre de points trouvés (nb_points vaut 1 même si on a trouvé aucun point)
+    def molette(self, event):
+        """Callback de zoom (molette vers l'avant) ou de dézoom (molette vers l'arrière) centré sur le pointeur
+        de la souris. Le zoom est converti en un cadre de zoom équivalent, éventuellement plus grand que le canevas
+        en cas de dézoom, dont le point désigné par la souris reste fixe.
+        """
+        if event.num == 5 or event.delta < 0:
+            facteur = 1 / CanvasMandel.facteur_molette
+        else:
+            facteur = CanvasMandel.facteur_molette
+        # Cadre de zoom équivalent
+        pxa, pya = event.x * (1 - 1/facteur), event.y * (1 - 1/facteur)
+        pxb, pyb = pxa + self.largeur / facteur, pya + self.hauteur / facteur
+        # Stockage de la position de la souris pour l'affichage de ses coordonnées après le zoom
+        self.dernier_x, self.dernier_y = event.x, event.y
+        # Ajout des bornes de zoom au stockage et appel à la méthode de zoom du parent
+        self.ajoute_bornes((pxa, pxb, pya, pyb))
+        self.parent.enregistre("molette", x=event.x, y=event.y, avant=facteur > 1)
+        self.parent.zoom_molette((pxa, pxb, pya, pyb))
+
+    def redimensionne(self, event):
+        """Callback de redimensionnement du canevas. Les cadres de zoom stockés sont adaptés aux nouvelles
+        dimensions : la zone étant étendue ou rognée à échelle constante (voir Zone.redimensionne), seule la
+        taille des cadres change pour que le retour en arrière conduise aux zones précédentes redimensionnées.
+        """
+        largeur, hauteur = event.width, event.height
+        if (largeur, hauteur) == (self.largeur, self.hauteur) or largeur < 2 or hauteur < 2:
+            return
+        facteur = largeur / self.largeur
+        self.stockage_bornes = [(pxa, pxa + (pxb - pxa) * facteur, pya, pya + (pxb - pxa) * facteur * hauteur / largeur)
+                                for pxa, pxb, pya, pyb in self.stockage_bornes]
+        self.largeur = largeur
+        self.hauteur = hauteur
+        self.K = hauteur / largeur
+        self.parent.enregistre("redimensionnement", largeur=largeur, hauteur=hauteur)
+        self.parent.redimensionne(largeur, hauteur)
 
     def retrace_complet(self, ensemble):
-        """Méthode de retracé du canevas : suppression des éléments marqués comme tels (ensemble
-        courant, cadre de zoom), tracé d'un nouvel ensemble.
+        """Méthode de retracé du canevas : suppression des éléments marqués comme tels (cadre de zoom),
+        tracé d'un nouvel ensemble sous la forme d'une image (voir trace_image).
         """
         self.delete(CanvasMandel.etiquette_efface)
-        self.trace_ensemble(ensemble)
+        self.trace_image(image_pgm(np.where(ensemble, 0, 255)))
+
+    def trace_image(self, donnees_pgm):
+        """Méthode de tracé de l'ensemble sous la forme d'une image au format PGM (voir image_pgm), utilisée pour
+        tous les tracés : aperçus immédiats, ensembles exacts et premier tracé au lancement de l'application, qui ne
+        nécessite en outre pas de calcul lorsque l'image provient du cache (voir CacheVues)
+        """
+        self.densite_affichee = False
+        self.affiche_image(PhotoImage(data=donnees_pgm, format="PPM"))
+
+    def trace_densite(self, niveaux):
+        """Méthode de tracé d'une image en niveaux de gris (densité des orbites du mode Buddhabrot).
+        Lors des rafraîchissements successifs, un éventuel cadre de zoom en cours de tracé est conservé.
+        """
+        if not self.densite_affichee:
+            self.delete(CanvasMandel.etiquette_efface)
+            self.densite_affichee = True
+        self.affiche_image(PhotoImage(data=image_pgm(niveaux), format="PPM"))
+
+    def affiche_image(self, image):
+        """Affichage d'une image dans l'unique élément image du canevas, remplacée en place (un seul élément quel que
+        soit le contenu de l'image, contrairement à un tracé par lignes) et placée sous un éventuel cadre de zoom
+        """
+        self.image = image  # référence conservée pour l'affichage
+        if self.item_image is None:
+            self.item_image = self.create_image(0, 0, anchor=NW, image=self.image, tags=CanvasMandel.etiquette_garde)
+        else:
+            self.itemconfigure(self.item_image, image=self.image)
+        self.tag_lower(self.item_image)
 
 
 class CadreCoordonnees(Frame):
@@ -279,18 +974,23 @@ class CadreCoordonnees(Frame):
     Les deux Label sont affichés en ligne si leur largeur totale ne dépasse pas celle du canevas situé
     au-dessus du cadre et en colonne sinon (l'un au-dessous de l'autre, ancrés respectivement à gauche
     et à droite).
+
+    Un troisième Label, à la suite du premier, affiche l'avancement et le temps restant estimé du
+    calcul de l'ensemble en cours.
     """
 
     def __init__(self, parent):
         Frame.__init__(self, parent, background="white")
         # Label pour les bornes de la zone de représentation
         self.label_bornes = Label(self, font="Arial 10", background="white")
-        self.label_bornes.pack(side=LEFT)
+        # Label pour l'avancement du calcul en cours
+        self.label_progression = Label(self, text="", font="Arial 10", foreground="grey40", background="white")
         # Label pour les coordonnées du point désigné par la souris
         self.label_coord = Label(self, text="", justify= "right", font="Arial 10", background="white")
-        self.label_coord.pack(side=RIGHT)
-        # Type de disposition
-        self.en_ligne = True
+        # Type de disposition, facteur de largeur de 'label_coord' (voir prepare_disposition) et largeur du canevas
+        self.dispose(en_ligne=True)
+        self.facteur = 1.0
+        self.largeur_max = parent.canevas.winfo_reqwidth()
 
     def affiche_bornes(self, xa, xb, ya, yb):
         """Méthode d'affichage dans 'label_bornes' des bornes de la zone de représentation.
@@ -304,6 +1004,22 @@ class CadreCoordonnees(Frame):
         # Affichage des bornes
         self.label_bornes.configure(text=f" x = [{xa:.{self.prec_x}f}, {xb:.{self.prec_x}f}], y = [{yb:.{self.prec_y}f}, {ya:.{self.prec_y}f}]")
 
+    def affiche_progression(self, avancement, restant, largeur_max):
+        """Méthode d'affichage dans 'label_progression' de l'avancement (de 0 à 1) et du temps restant estimé (en secondes)
+        du calcul en cours. La disposition est préparée avec la largeur du nouveau texte, pour que l'agrandissement du
+        Label n'élargisse pas la fenêtre (et donc le canevas, ce qui provoquerait un redimensionnement)
+        """
+        texte = f" calcul : {avancement:.0%}"
+        if restant is not None:
+            texte += f", {restant:.1f} s restantes"
+        self.largeur_max = largeur_max
+        self.prepare_disposition(self.facteur, largeur_max, texte)
+        self.label_progression.configure(text=texte)
+
+    def efface_progression(self):
+        self.prepare_disposition(self.facteur, self.largeur_max, "")
+        self.label_progression.configure(text="")
+
     def affiche_coordonnees_souris(self, x, y, largeur_max):
         """Méthode d'affichage dans 'label_coord' des coordonnées réelles du point désigné par la souris dans le canevas
         
@@ -312,11 +1028,13 @@ class CadreCoordonnees(Frame):
         c'est la valeur largeur_label_bornes + 0.5 x largeur_label_bornes = 1.5 x largeur_label_bornes (par rapport à la
         largeur du canevas) qui dicte l'agencement des widgets, d'où le facteur 1.5 (augmenté à 1.55 pour prévoir une marge)
         """
+        self.largeur_max = largeur_max
         self.prepare_disposition(1.55, largeur_max)
         self.label_coord.configure(text=f"x = {x:.{self.prec_x}f}, y = {y:.{self.prec_y}f} ")
 
     def efface_coordonnees_souris(self):
         "Méthode effaçant dans 'label_coord' le texte des coordonnées réelles du point désigné par la souris dans le canevas"
+        self.facteur = 1.0
         self.label_coord.configure(text="")
 
     def affiche_coordonnees_zoom(self, xaz, xbz, yaz, ybz, largeur_max):
@@ -327,10 +1045,11 @@ class CadreCoordonnees(Frame):
         zoom, c'est la valeur 2 x largeur_label_bornes (par rapport à la largeur du canevas) qui dicte l'agencement des widgets,
         d'où le facteur 2 (augmenté à 2.05 pour prévoir une marge)
         """
+        self.largeur_max = largeur_max
         self.prepare_disposition(2.05, largeur_max)
         self.label_coord.configure(text=f"x = [{xaz:.{self.prec_x}f}, {xbz:.{self.prec_x}f}], y = [{ybz:.{self.prec_y}f}, {yaz:.{self.prec_y}f}] ")
 
-    def prepare_disposition(self, facteur, largeur_max):
+    def prepare_disposition(self, facteur, largeur_max, texte_progression=None):
         """Méthode permettant de préparer la disposition (en ligne ou en colonne) des widgets 'label_bornes'
         et 'label_coord' dans ce widget en fonction de la largeur de 'label_bornes' et d'un facteur dépendant
         de l'information à afficher dans 'label_coord'.
@@ -344,19 +1063,90 @@ class CadreCoordonnees(Frame):
         la largeur totale des deux widgets est inférieure à celle du canevas, on les affiche en ligne ; si elle est
         supérieure, on les affiche en colonne. Un attribut booléen permet de modifier l'agencement seulement lorsque
         la largeur totale change de position par rapport à la largeur du canevas (passe de < à > ou de > à <) et pas
-        à chaque appel de fonction.
+        à chaque appel de fonction. Le Label d'avancement du calcul, placé entre les deux autres, est compté dans la
+        largeur totale (avec la largeur de 'texte_progression' s'il est sur le point d'être affiché) et suit la même
+        disposition.
         """
-        largeur_label_bornes = self.label_bornes.winfo_width()
-        # Disposition actuelle en ligne et largeur a priori des deux widgets qui dépasse celle du canevas => disposition en colonne
-        if self.en_ligne and facteur * largeur_label_bornes > largeur_max:
-            self.label_bornes.pack(side=TOP, anchor="w")
-            self.label_coord.pack(side=TOP, anchor="e")
-            self.en_ligne = False
-        # Disposition actuelle en colonne et largeur a priori des deux widgets qui est inférieure à celle du canevas => disposition en ligne
-        elif not self.en_ligne and facteur * largeur_label_bornes <= largeur_max:
+        self.facteur = facteur
+        if texte_progression is None:
+            largeur_progression = self.label_progression.winfo_width()
+        else:
+            largeur_progression = self.tk.call("font", "measure", self.label_progression.cget("font"), texte_progression)
+        largeur = facteur * self.label_bornes.winfo_width() + largeur_progression
+        # Disposition actuelle en ligne et largeur a priori des widgets qui dépasse celle du canevas => disposition en colonne
+        if self.en_ligne and largeur > largeur_max:
+            self.dispose(en_ligne=False)
+        # Disposition actuelle en colonne et largeur a priori des widgets qui est inférieure à celle du canevas => disposition en ligne
+        elif not self.en_ligne and largeur <= largeur_max:
+            self.dispose(en_ligne=True)
+
+    def dispose(self, en_ligne):
+        "Placement des trois Label, dans l'ordre, en ligne ou en colonne"
+        for label in (self.label_bornes, self.label_progression, self.label_coord):
+            label.pack_forget()
+        if en_ligne:
             self.label_bornes.pack(side=LEFT)
+            self.label_progression.pack(side=LEFT)
             self.label_coord.pack(side=RIGHT)
-            self.en_ligne = True
+        else:
+            self.label_bornes.pack(side=TOP, anchor="w")
+            self.label_progression.pack(side=TOP, anchor="w")
+            self.label_coord.pack(side=TOP, anchor="e")
+        self.en_ligne = en_ligne
+
+
+class CadreApercu(Canvas):
+    """Widget de type Canvas affichant un aperçu de la navigation à côté du canevas principal.
+
+    Il contient :
+    - une vue d'ensemble de la zone de représentation initiale, sur laquelle un rectangle rouge
+      indique la position de la zone courante
+    - les vignettes des zones successives de l'historique de zoom (la plus récente, encadrée en rouge,
+      étant la zone courante), deux par ligne ; une vignette non encore calculée est remplacée par
+      un rectangle gris
+
+    Sa hauteur demandée est celle du canevas principal pour ne pas agrandir la fenêtre (et donc ce canevas)
+    au-delà des dimensions demandées.
+    """
+
+    largeur_vue = 128
+    largeur_vignette = 64
+    marge = 4
+
+    def __init__(self, parent, hauteur):
+        largeur = 2 * CadreApercu.largeur_vignette + 3 * CadreApercu.marge
+        Canvas.__init__(self, parent, width=largeur, height=hauteur, bg='white', borderwidth=0, highlightthickness=0)
+        self.images = []  # références des images affichées
+
+    def trace(self, vue, cadre, vignettes):
+        """Méthode de tracé de la vue d'ensemble 'vue', du rectangle 'cadre' (coordonnées en pixels dans la vue)
+        et des vignettes 'vignettes' (ensembles de Mandelbrot, ou None s'ils ne sont pas encore calculés)
+        """
+        self.delete(ALL)
+        self.images = []
+        marge = CadreApercu.marge
+        x_vue = (int(self["width"]) - vue.shape[1]) // 2
+        self.trace_vignette(vue, x_vue, marge)
+        x1, y1, x2, y2 = cadre
+        self.create_rectangle(x_vue + max(x1, 0), marge + max(y1, 0), x_vue + min(max(x2, x1 + 2), vue.shape[1]),
+                              marge + min(max(y2, y1 + 2), vue.shape[0]), outline='red')  # au moins 2 pixels pour rester visible
+        y = vue.shape[0] + 3 * marge
+        for i, vignette in enumerate(vignettes):
+            x = marge + (i % 2) * (CadreApercu.largeur_vignette + marge)
+            if vignette is not None:
+                self.trace_vignette(vignette, x, y)
+            else:
+                self.create_rectangle(x, y, x + CadreApercu.largeur_vignette, y + CadreApercu.largeur_vignette, fill='grey90', outline='')
+            if i == 0:
+                hauteur = CadreApercu.largeur_vignette if vignette is None else vignette.shape[0]
+                self.create_rectangle(x - 1, y - 1, x + CadreApercu.largeur_vignette, y + hauteur, outline='red')
+            if i % 2 == 1:
+                y += (CadreApercu.largeur_vignette if vignette is None else vignette.shape[0]) + marge
+
+    def trace_vignette(self, ensemble, x, y):
+        image = PhotoImage(data=image_pgm(np.where(ensemble, 0, 255)), format="PPM")
+        self.images.append(image)
+        self.create_image(x, y, anchor=NW, image=image)
 
 
 class Fenetre(Tk):
@@ -367,29 +1157,141 @@ class Fenetre(Tk):
     par les callbacks du canevas visant à modifier le modèle et mettre à jour l'interface :
     zoom ou dézoom de l'ensemble de Mandelbrot dans la zone de représentation et affichage
     de diverses coordonnées (voir CadreCoordonnees).
+
+    Le zoom à la molette et le redimensionnement de la fenêtre affichent immédiatement un aperçu
+    obtenu par rééchantillonnage de l'ensemble courant, puis lancent le calcul exact dans un fil
+    d'exécution séparé. Les événements rapprochés sont regroupés en un seul calcul (anti-rebond)
+    et un calcul rendu obsolète par un nouvel événement est abandonné.
+
+    La touche "b" bascule entre l'affichage de l'ensemble et celui de la densité des orbites
+    (voir Buddhabrot), calculée lot après lot tant que le mode est actif et relancée à chaque
+    changement de zone.
+
+    La touche "a" lance l'estimation de l'aire de l'ensemble dans la zone courante (voir
+    EstimationAire), dont les résultats sont affichés en console.
+
+    Les interactions de l'utilisateur peuvent être enregistrées dans un script (voir Enregistreur)
+    qui sera rejoué pour mesurer leurs latences (voir Rejeu).
+
+    Un aperçu de la navigation (voir CadreApercu) est affiché à droite du canevas. Ses vignettes
+    sont calculées en une seule passe (voir Mandelbrot.calcul_ensembles) dans un fil d'exécution
+    séparé, une fois le tracé principal terminé, et conservées en cache.
     """
 
-    def __init__(self, largeur, hauteur, xa, xb, ya, n_iter):
+    delai_rendu = 150       # délai d'inactivité (ms) avant le lancement du calcul exact
+    delai_redimensionnement = 30  # délai (ms) de regroupement des événements de redimensionnement avant l'aperçu
+    periode_sondage = 20    # période (ms) de vérification de la fin du calcul exact
+    lots_par_affichage = 5  # nombre de lots du mode Buddhabrot entre deux rafraîchissements de l'image
+    precision_aire = 1e-3   # précision relative (à l'aire de la zone) visée par l'estimation de l'aire
+    nb_vignettes = 8        # nombre maximal de vignettes de l'historique de zoom affichées
+    taille_cache_vignettes = 64
+
+    def __init__(self, largeur, hauteur, xa, xb, ya, n_iter, service=None, enregistreur=None, budget=None, reduction_auto=False):
         Tk.__init__(self)
         self.title("Fractale de Mandelbrot")
-        # Création du canevas d'affichage
+        # Création du canevas d'affichage, du cadre de coordonnées en dessous et de l'aperçu de navigation à droite
         self.canevas = CanvasMandel(self, largeur, hauteur)
-        self.canevas.pack()
-        # Création du cadre de coordonnées
         self.cadre_coordonnees = CadreCoordonnees(self)
-        self.cadre_coordonnees.pack(fill=X)
-        # Création d'un objet Mandelbrot
-        self.mandel = Mandelbrot(largeur, hauteur, xa, xb, ya, n_iter)
-
-    def lancement(self):
-        # Calcul de l'ensemble
-        self.mandel.calcul_ensemble()
+        self.cadre_apercu = CadreApercu(self, hauteur)
+        self.cadre_coordonnees.pack(side=BOTTOM, fill=X)
+        self.cadre_apercu.pack(side=RIGHT, fill=Y)
+        self.canevas.pack(side=LEFT, fill=BOTH, expand=True)
+        # Création d'un objet Mandelbrot, local ou délégant ses calculs à un service
+        if service is None:
+            self.mandel = Mandelbrot(largeur, hauteur, xa, xb, ya, n_iter)
+        else:
+            self.mandel = MandelbrotDistant(service, largeur, hauteur, xa, xb, ya, n_iter)
+        self.mandel.budget = budget
+        self.mandel.reduction_auto = reduction_auto
+        # État du calcul exact en arrière-plan
+        self.generation = 0             # incrémenté à chaque modification de la zone, pour écarter les résultats périmés
+        self.rendu_planifie = None      # identifiant du calcul exact en attente (anti-rebond)
+        self.modele_en_calcul = None    # copie du modèle en cours de calcul
+        self.redimensionnement_planifie = None  # identifiant de l'aperçu de redimensionnement en attente (anti-rebond)
+        self.taille_demandee = None     # dernières dimensions du canevas reçues, à appliquer au modèle
+        # Mode Buddhabrot
+        self.buddhabrot = None
+        self.bind("<b>", self.bascule_buddhabrot)
+        # Estimation de l'aire
+        self.estimation_aire = None
+        self.bind("<a>", self.estime_aire)
+        # Enregistrement des interactions, sauvegardé à la fermeture de la fenêtre
+        self.enregistreur = enregistreur
+        self.protocol("WM_DELETE_WINDOW", self.ferme)
+        # Aperçu de la navigation : zone initiale, cache des vignettes et fil de calcul des vignettes manquantes
+        self.zone_initiale = (xa, xb, ya)
+        self.vignettes = {}
+        self.executeur_vignettes = None     # créé au premier calcul de vignettes
+        self.calcul_vignettes = None        # calcul de vignettes en cours (objet Future)
+        self.vignettes_planifiees = False   # calcul de vignettes en attente de la fin du calcul exact
+
+    def lancement(self, chronometre=None):
+        """Premier tracé de l'ensemble puis lancement de la boucle d'événements.
+
+        L'image de la zone initiale est lue dans le cache sur disque (voir CacheVues) ou, à défaut, calculée
+        puis mise en cache. Elle est tracée d'un bloc (voir CanvasMandel.trace_image) et affichée avant
+        toute autre initialisation : l'aperçu de navigation et ses fils de calcul sont initialisés ensuite.
+        """
+        chronometre = chronometre or Chronometre(False)
+        cache = CacheVues()
+        zone = self.mandel.zone
+        cle = (zone.A.x, zone.B.x, zone.A.y, zone.im_pix.largeur, zone.im_pix.hauteur, self.mandel.n_iter)
+        donnees_pgm = cache.lit(cle)
+        depuis_cache = donnees_pgm is not None
+        # L'ensemble doit être connu avant le premier update_idletasks, qui peut déclencher un redimensionnement
+        # du canevas (voir Fenetre.redimensionne) : le premier calcul se fait donc sans suivi de l'avancement
+        if depuis_cache:
+            self.mandel.ensemble = ensemble_pgm(donnees_pgm)
+        else:
+            self.mandel.calcul_ensemble(en_parallele=False)
+            donnees_pgm = image_pgm(np.where(self.mandel.ensemble, 0, 255))
+            if self.mandel.reduction == 1:  # une image à résolution réduite n'est pas la vue exacte
+                cache.ecrit(cle, donnees_pgm)
+            chronometre.etape("calcul de la zone initiale")
         # Tracé de l'ensemble et affichage des bornes
-        self.canevas.trace_ensemble(self.mandel.ensemble)
+        self.canevas.trace_image(donnees_pgm)
         self.affiche_bornes()
-        # Lancement de la boucle d'événements
+        self.update_idletasks()
+        chronometre.etape("premier tracé" + (" (depuis le cache)" if depuis_cache else ""))
+        # Initialisations différées puis lancement de la boucle d'événements
+        self.after_idle(self.initialisation_differee, chronometre)
         self.mainloop()
 
+    def initialisation_differee(self, chronometre):
+        """Initialisations effectuées après le premier tracé, au démarrage de la boucle d'événements : origine
+        des instants de l'enregistrement des interactions (comme pour le rejeu) et aperçu de navigation (avec
+        son fil de calcul)
+        """
+        if self.enregistreur is not None:
+            self.enregistreur.demarre()
+        self.maj_apercu()
+        chronometre.etape("initialisation différée")
+        chronometre.rapport()
+
+    def ferme(self):
+        """Callback de fermeture de la fenêtre, avec sauvegarde de l'éventuel enregistrement des interactions.
+        Les calculs en cours sont interrompus et ceux en attente annulés : les fils d'exécution de calcul ne
+        sont pas des démons et retarderaient sinon la fin du programme jusqu'à leur terme.
+        """
+        if self.enregistreur is not None:
+            self.enregistreur.sauve()
+        self.annule_rendu()
+        if self.calcul_vignettes is not None:
+            self.calcul_vignettes.cancel()
+        if self.executeur_vignettes is not None:
+            self.executeur_vignettes.shutdown(wait=False, cancel_futures=True)
+        Mandelbrot.arrete_executeur()
+        self.destroy()
+
+    def enregistre(self, type, **donnees):
+        "Méthode appelée par les callbacks du canevas pour enregistrer une interaction, si l'enregistrement est actif"
+        if self.enregistreur is not None:
+            self.enregistreur.ajoute(type, **donnees)
+
+    def rendu_termine(self):
+        "Indique si l'affichage est à jour, c'est-à-dire si aucun redimensionnement ni calcul exact n'est planifié ou en cours"
+        return self.redimensionnement_planifie is None and self.rendu_planifie is None and self.modele_en_calcul is None
+
     def affiche_bornes(self):
         """Méthode d'affichage des bornes de la zone de représentation.
         Les bornes ne changent pas pour un même tracé de l'ensemble. La fonction
@@ -432,6 +1334,9 @@ class Fenetre(Tk):
         self.cadre_coordonnees.affiche_coordonnees_zoom(xaz, xbz, yaz, ybz, self.canevas.winfo_width())
 
     def zoom_dezoom(self, bornes, type):
+        # Application d'un éventuel redimensionnement en attente puis abandon d'un éventuel calcul en arrière-plan, rendu obsolète
+        self.applique_redimensionnement()
+        self.annule_rendu()
         # Modification du modèle
         if type == 1:   # zoom
             pxa, pxb, pya = bornes
@@ -439,14 +1344,436 @@ class Fenetre(Tk):
         elif type == 2: # dezoom
             pxa, pxb, pya, pyb = bornes
             self.mandel.zone.maj_bornes_dezoom(pxa, pxb, pya, pyb)
-        self.mandel.calcul_ensemble()
+        self.mandel.zone.aligne_sur_axe()
+        self.mandel.calcul_ensemble(self.suivi_calcul)
         # Modification de l'affichage
-        self.canevas.retrace_complet(self.mandel.ensemble)
+        self.cadre_coordonnees.efface_progression()
+        self.retrace()
         self.affiche_bornes()
+        self.maj_apercu()
         if self.canevas.souris_dedans:  # if pour éviter d'afficher les précédentes coordonnées de la souris dans le cas "sortie du canevas puis ctrl-z"
             self.update_idletasks()  # Mise à jour de l'affichage pour avoir la bonne taille de 'label_bornes' dans 'cadre_coordonnees' et afficher correctement 'label_coord'
             self.affiche_coordonnees_souris(self.canevas.dernier_x, self.canevas.dernier_y)  # On force l'affichage des coordonnées de la souris à partir de sa dernière position (gestion du cas "absence d'événements")
 
+    def zoom_molette(self, bornes):
+        """Méthode appelée par la callback de molette du canevas : modification du modèle à partir
+        du cadre de zoom équivalent, aperçu immédiat par rééchantillonnage puis calcul exact différé.
+        """
+        pxa, pxb, pya, pyb = bornes
+        self.applique_redimensionnement()
+        largeur, hauteur = self.mandel.zone.im_pix.largeur, self.mandel.zone.im_pix.hauteur
+        apercu = self.mandel.apercu(pxa, pya, (pxb - pxa) / largeur, largeur, hauteur)
+        self.mandel.zone.maj_bornes_zoom(pxa, pxb, pya)
+        self.mandel.zone.aligne_sur_axe()
+        self.affiche_apercu(apercu)
+
+    def redimensionne(self, largeur, hauteur):
+        """Méthode appelée par la callback de redimensionnement du canevas. Les événements rapprochés (fenêtre
+        redimensionnée à la souris) sont regroupés : seules les dernières dimensions sont appliquées, après
+        'delai_redimensionnement' ms (voir applique_redimensionnement).
+        """
+        self.taille_demandee = (largeur, hauteur)
+        if self.redimensionnement_planifie is None:
+            self.redimensionnement_planifie = self.after(Fenetre.delai_redimensionnement, self.applique_redimensionnement)
+
+    def applique_redimensionnement(self):
+        """Application au modèle des dernières dimensions du canevas reçues, s'il y en a : l'ensemble courant est
+        rogné ou complété en blanc pour l'aperçu, puis recalculé exactement sur la zone redimensionnée. Appelée
+        également avant tout zoom, pour que le modèle corresponde au canevas.
+        """
+        if self.redimensionnement_planifie is not None:
+            self.after_cancel(self.redimensionnement_planifie)
+            self.redimensionnement_planifie = None
+        if self.taille_demandee is None:
+            return
+        largeur, hauteur = self.taille_demandee
+        self.taille_demandee = None
+        apercu = self.mandel.apercu(0, 0, 1, largeur, hauteur)
+        self.mandel.redimensionne(largeur, hauteur)
+        self.mandel.zone.aligne_sur_axe()
+        self.affiche_apercu(apercu)
+
+    def affiche_apercu(self, apercu):
+        "Affichage d'un aperçu de l'ensemble et des nouvelles bornes, et planification du calcul exact"
+        self.annule_rendu()
+        self.mandel.ensemble = apercu
+        self.retrace()
+        self.affiche_bornes()
+        # Calcul exact planifié avant la mise à jour de l'aperçu, pour que le calcul des vignettes l'attende
+        self.rendu_planifie = self.after(Fenetre.delai_rendu, self.lance_rendu)
+        self.maj_apercu()
+        if self.canevas.souris_dedans:
+            self.update_idletasks()
+            self.affiche_coordonnees_souris(self.canevas.dernier_x, self.canevas.dernier_y)
+
+    def annule_rendu(self):
+        "Annulation du calcul exact planifié ou en cours, dont le résultat ne correspondrait plus à la zone courante"
+        self.generation += 1
+        if self.rendu_planifie is not None:
+            self.after_cancel(self.rendu_planifie)
+            self.rendu_planifie = None
+        if self.modele_en_calcul is not None:
+            self.modele_en_calcul.interrompu = True
+            self.modele_en_calcul = None
+            self.cadre_coordonnees.efface_progression()
+
+    def lance_rendu(self):
+        "Lancement du calcul exact sur une copie du modèle, dans un fil d'exécution séparé"
+        self.rendu_planifie = None
+        self.modele_en_calcul = self.mandel.copie()
+        fil = threading.Thread(target=self.modele_en_calcul.calcul_ensemble, daemon=True)
+        fil.start()
+        self.after(Fenetre.periode_sondage, self.termine_rendu, fil, self.modele_en_calcul, self.generation)
+
+    def termine_rendu(self, fil, modele, generation, averti=False):
+        """Attente de la fin du calcul exact, avec affichage de son avancement et avertissement en cas de dépassement
+        du budget, puis tracé de l'ensemble s'il correspond toujours à la zone courante
+        """
+        if generation != self.generation:
+            return
+        avancement, restant = modele.progression
+        if fil.is_alive():
+            self.cadre_coordonnees.affiche_progression(avancement, restant, self.canevas.winfo_width())
+            if not averti and restant is not None:
+                self.avertit_budget(modele, restant)
+                averti = True
+            self.after(Fenetre.periode_sondage, self.termine_rendu, fil, modele, generation, averti)
+        else:
+            self.cadre_coordonnees.efface_progression()
+            self.modele_en_calcul = None
+            self.mandel.ensemble = modele.ensemble
+            if self.buddhabrot is None:
+                self.canevas.retrace_complet(self.mandel.ensemble)
+
+    def suivi_calcul(self, avancement, restant):
+        "Fonction de suivi des calculs exécutés dans le fil d'exécution de l'interface : affichage de l'avancement"
+        if avancement == 0 and restant is not None:
+            self.avertit_budget(self.mandel, restant)
+        self.cadre_coordonnees.affiche_progression(avancement, restant, self.canevas.winfo_width())
+        self.update_idletasks()
+
+    def avertit_budget(self, modele, restant):
+        "Avertissement en console lorsque la durée estimée d'un calcul dépasse le budget fixé"
+        if modele.budget is None:
+            return
+        if modele.reduction > 1:
+            print(f"Calcul estimé au-delà du budget de {modele.budget} s : résolution réduite d'un facteur {modele.reduction}")
+        elif restant > modele.budget:
+            print(f"Attention : calcul estimé à {restant:.1f} s, au-delà du budget de {modele.budget} s")
+
+    def zones_historique(self):
+        "Liste des zones de l'historique de zoom, de la zone courante à la plus ancienne, déduites des cadres de zoom stockés"
+        zone = self.mandel.zone.copie()
+        zones = [zone]
+        for bornes in reversed(self.canevas.stockage_bornes):
+            zone = zone.copie()
+            zone.maj_bornes_dezoom(*bornes)
+            zones.append(zone)
+        return zones
+
+    @staticmethod
+    def cle_vignette(zone):
+        """Clé de cache d'une vignette, insensible aux erreurs d'arrondi commises lors de la reconstitution
+        des zones de l'historique (position au seizième de pixel près, échelle à 0,1 % près)"""
+        return (round(zone.A.x / zone.Kxy * 16), round(zone.A.y / zone.Kxy * 16), round(np.log(zone.Kxy) * 1000),
+                zone.im_pix.largeur, zone.im_pix.hauteur)
+
+    def zones_apercu(self):
+        "Zones de la vue d'ensemble et des vignettes de l'historique, aux dimensions de l'aperçu de navigation"
+        R = self.mandel.zone.im_pix.R
+        largeur_vue, largeur_vignette = CadreApercu.largeur_vue, CadreApercu.largeur_vignette
+        vue = Zone(largeur_vue, max(1, round(largeur_vue * R)), *self.zone_initiale)
+        zones = [Zone(largeur_vignette, max(1, round(largeur_vignette * R)), z.A.x, z.B.x, z.A.y)
+                 for z in self.zones_historique()[:Fenetre.nb_vignettes]]
+        return vue, zones
+
+    def maj_apercu(self):
+        """Mise à jour de l'aperçu de navigation avec les vignettes disponibles en cache et planification
+        du calcul des vignettes manquantes.
+        """
+        vue, zones = self.zones_apercu()
+        cle_vue = Fenetre.cle_vignette(vue)
+        if cle_vue in self.vignettes:
+            zone = self.mandel.zone
+            cadre = ((zone.A.x - vue.A.x) / vue.Kxy, (vue.A.y - zone.A.y) / vue.Kxy,
+                     (zone.B.x - vue.A.x) / vue.Kxy, (vue.A.y - zone.B.y) / vue.Kxy)
+            self.cadre_apercu.trace(self.vignettes[cle_vue], cadre, [self.vignettes.get(Fenetre.cle_vignette(z)) for z in zones])
+        manquantes = any(Fenetre.cle_vignette(z) not in self.vignettes for z in [vue] + zones)
+        if manquantes and self.calcul_vignettes is None and not self.vignettes_planifiees:
+            self.vignettes_planifiees = True
+            self.lance_vignettes()
+
+    def lance_vignettes(self):
+        """Lancement du calcul des vignettes manquantes en une seule passe (voir Mandelbrot.calcul_ensembles),
+        dans un fil d'exécution séparé et seulement une fois le calcul exact de l'ensemble terminé, pour ne pas
+        le ralentir
+        """
+        if not self.rendu_termine():
+            self.after(Fenetre.periode_sondage, self.lance_vignettes)
+            return
+        self.vignettes_planifiees = False
+        vue, zones = self.zones_apercu()
+        manquantes = [z for z in [vue] + zones if Fenetre.cle_vignette(z) not in self.vignettes]
+        if self.executeur_vignettes is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self.executeur_vignettes = ThreadPoolExecutor(1)
+        self.calcul_vignettes = self.executeur_vignettes.submit(self.mandel.copie().calcul_ensembles, manquantes)
+        self.after(Fenetre.periode_sondage, self.termine_vignettes, manquantes)
+
+    def termine_vignettes(self, zones):
+        "Attente de la fin du calcul des vignettes, mise en cache (limitée aux plus récentes) et mise à jour de l'aperçu"
+        if not self.calcul_vignettes.done():
+            self.after(Fenetre.periode_sondage, self.termine_vignettes, zones)
+            return
+        ensembles = self.calcul_vignettes.result()
+        self.calcul_vignettes = None
+        for zone, ensemble in zip(zones, ensembles):
+            self.vignettes[Fenetre.cle_vignette(zone)] = ensemble
+        while len(self.vignettes) > Fenetre.taille_cache_vignettes:
+            del self.vignettes[next(iter(self.vignettes))]
+        self.maj_apercu()
+
+    def retrace(self):
+        "Retracé du canevas selon le mode d'affichage : ensemble de Mandelbrot, ou densité des orbites relancée sur la zone courante"
+        if self.buddhabrot is None:
+            self.canevas.retrace_complet(self.mandel.ensemble)
+        else:
+            self.lance_buddhabrot()
+
+    def bascule_buddhabrot(self, event):
+        "Callback de la touche 'b' : activation ou désactivation du mode Buddhabrot"
+        if self.buddhabrot is None:
+            self.lance_buddhabrot()
+        else:
+            self.buddhabrot = None
+            self.canevas.retrace_complet(self.mandel.ensemble)
+
+    def lance_buddhabrot(self):
+        "(Re)démarrage de l'accumulation de la densité des orbites sur la zone courante"
+        self.buddhabrot = Buddhabrot(self.mandel.zone, self.mandel.n_iter)
+        self.after_idle(self.etape_buddhabrot, self.buddhabrot, 1)
+
+    def etape_buddhabrot(self, buddhabrot, num_lot):
+        """Calcul d'un lot du mode Buddhabrot et rafraîchissement de l'image tous les 'lots_par_affichage' lots.
+        Chaque lot est planifié par la boucle d'événements pour que l'interface reste réactive ; l'enchaînement
+        s'arrête lorsque le mode est désactivé ou relancé sur une nouvelle zone.
+        """
+        if buddhabrot is not self.buddhabrot:
+            return
+        buddhabrot.calcul_lot()
+        if num_lot % Fenetre.lots_par_affichage == 1:  # premier lot puis tous les 'lots_par_affichage' lots
+            self.canevas.trace_densite(buddhabrot.image())
+        self.after(1, self.etape_buddhabrot, buddhabrot, num_lot + 1)
+
+    def estime_aire(self, event):
+        """Callback de la touche 'a' : estimation de l'aire de l'ensemble dans la zone courante, dans un fil
+        d'exécution séparé (les lots étant eux-mêmes répartis sur plusieurs processus)
+        """
+        if self.estimation_aire is not None and self.estimation_aire.is_alive():
+            print("Estimation de l'aire déjà en cours")
+            return
+        zone = self.mandel.zone
+        modele = Mandelbrot(zone.im_pix.largeur, zone.im_pix.hauteur, zone.A.x, zone.B.x, zone.A.y, self.mandel.n_iter)
+        precision = Fenetre.precision_aire * (zone.B.x - zone.A.x) * (zone.A.y - zone.B.y)
+        self.estimation_aire = threading.Thread(target=affiche_estimations_aire, args=(modele, precision), daemon=True)
+        self.estimation_aire.start()
+
+
+class CacheVues():
+    """Classe du cache sur disque des images des zones initiales, au format PGM (voir image_pgm).
+
+    Une image est identifiée par les bornes de la zone, ses dimensions et le nombre d'itérations. Le cache
+    se trouve dans le répertoire de cache de l'utilisateur ; il est ignoré s'il n'est pas accessible.
+    Les images sont écrites dans un fichier temporaire renommé ensuite, et leur en-tête et leur taille sont
+    vérifiés à la lecture : un fichier tronqué ou corrompu est supprimé et l'image recalculée.
+    """
+
+    def __init__(self, repertoire=None):
+        if repertoire is None:
+            repertoire = os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "MandelbroTkinter")
+        self.repertoire = repertoire
+
+    def chemin(self, cle):
+        "Chemin du fichier d'une image de clé cle = (xa, xb, ya, largeur, hauteur, n_iter)"
+        xa, xb, ya, largeur, hauteur, n_iter = cle
+        return os.path.join(self.repertoire, f"vue_{xa!r}_{xb!r}_{ya!r}_{largeur}x{hauteur}_n{n_iter}.pgm")
+
+    def lit(self, cle):
+        "Lecture de l'image de clé cle, ou None si elle est absente ou invalide (le fichier est alors supprimé)"
+        chemin = self.chemin(cle)
+        try:
+            with open(chemin, "rb") as fichier:
+                donnees_pgm = fichier.read()
+        except OSError:
+            return None
+        if CacheVues.valide(donnees_pgm, cle[3], cle[4]):
+            return donnees_pgm
+        try:
+            os.remove(chemin)
+        except OSError:
+            pass
+        return None
+
+    @staticmethod
+    def valide(donnees_pgm, largeur, hauteur):
+        "Vérification de l'en-tête d'une image au format produit par image_pgm et de la taille de ses pixels"
+        morceaux = donnees_pgm.split(b" ", 4)
+        if len(morceaux) != 5:
+            return False
+        return (morceaux[:4] == [b"P5", str(largeur).encode(), str(hauteur).encode(), b"255"]
+                and len(morceaux[4]) == largeur * hauteur)
+
+    def ecrit(self, cle, donnees_pgm):
+        "Écriture de l'image de clé cle dans un fichier temporaire, renommé une fois l'écriture terminée"
+        chemin = self.chemin(cle)
+        temporaire = f"{chemin}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.repertoire, exist_ok=True)
+            with open(temporaire, "wb") as fichier:
+                fichier.write(donnees_pgm)
+            os.replace(temporaire, chemin)
+        except OSError:
+            try:
+                os.remove(temporaire)
+            except OSError:
+                pass
+
+
+class Chronometre():
+    "Classe de mesure des durées des étapes du lancement de l'application (option --timing)"
+
+    def __init__(self, actif, debut=None):
+        self.actif = actif
+        self.debut = self.precedent = debut if debut is not None else time.perf_counter()
+        self.etapes = []
+
+    def etape(self, nom):
+        instant = time.perf_counter()
+        self.etapes.append((nom, instant - self.precedent, instant - self.debut))
+        self.precedent = instant
+
+    def rapport(self):
+        if self.actif:
+            print("Durées du lancement (ms) :")
+            for nom, duree, cumul in self.etapes:
+                print(f"  {nom:<40} {1000 * duree:8.1f} (cumul : {1000 * cumul:8.1f})")
+
+
+class Enregistreur():
+    """Classe d'enregistrement des interactions de l'utilisateur dans un script rejouable (voir Rejeu).
+
+    Le script est un fichier JSON contenant les paramètres de lancement de l'application et la liste
+    des actions (zoom par cadre, retour en arrière, entrée dans le canevas, survol, sortie du canevas,
+    molette, redimensionnement), chacune datée en secondes depuis le début de l'enregistrement
+    (voir demarre).
+    """
+
+    def __init__(self, chemin, largeur, hauteur, xa, xb, ya, n_iter):
+        self.chemin = chemin
+        self.parametres = {"largeur": largeur, "hauteur": hauteur, "xa": xa, "xb": xb, "ya": ya, "n_iter": n_iter}
+        self.actions = []
+        self.debut = time.perf_counter()
+
+    def demarre(self):
+        "Début de l'enregistrement, au démarrage de la boucle d'événements : la durée du lancement n'est pas comptée"
+        self.debut = time.perf_counter()
+
+    def ajoute(self, type, **donnees):
+        self.actions.append({"t": time.perf_counter() - self.debut, "type": type, **donnees})
+
+    def sauve(self):
+        import json
+        with open(self.chemin, "w") as fichier:
+            json.dump({**self.parametres, "actions": self.actions}, fichier)
+        print(f"{len(self.actions)} actions enregistrées dans {self.chemin}")
+
+
+class Rejeu():
+    """Classe de rejeu d'un script d'interactions (voir Enregistreur) et de mesure de leurs latences.
+
+    Les actions sont déclenchées aux mêmes instants que lors de l'enregistrement, en appelant les
+    mêmes méthodes que les callbacks d'origine. La latence d'une action est la durée entre l'instant
+    prévu de son déclenchement et la fin du retracé qu'elle provoque : retracé synchrone pour le zoom
+    par cadre, le retour en arrière, l'entrée, le survol et la sortie du canevas, fin du calcul exact en arrière-plan pour la molette
+    et le redimensionnement (plusieurs crans de molette rapprochés se terminent ainsi ensemble).
+    Un retard pris sur une action se répercute sur la latence des suivantes, comme pour l'utilisateur.
+
+    À la fin du script, les centiles des latences sont affichés par type d'action et la fenêtre est fermée.
+    """
+
+    periode_sondage = 5                                 # période (ms) de vérification de la fin des calculs
+    actions_asynchrones = ("molette", "redimensionnement")
+
+    def __init__(self, fenetre, actions):
+        self.fenetre = fenetre
+        self.actions = actions
+        self.latences = {}
+        self.en_attente = []  # actions asynchrones en attente de la fin du calcul exact : (type, instant prévu)
+
+    def lance(self):
+        "Planification du rejeu au démarrage de la boucle d'événements, après le premier tracé"
+        self.fenetre.after(0, self.demarre)
+
+    def demarre(self):
+        self.debut = time.perf_counter()
+        self.indice = 0
+        self.etape()
+
+    def etape(self):
+        "Déclenchement des actions dont l'instant est atteint et relevé des latences des actions terminées"
+        while self.indice < len(self.actions) and self.actions[self.indice]["t"] <= time.perf_counter() - self.debut:
+            action = self.actions[self.indice]
+            self.execute(action)
+            self.fenetre.update_idletasks()
+            if action["type"] in Rejeu.actions_asynchrones:
+                self.en_attente.append((action["type"], action["t"]))
+            else:
+                self.ajoute_latence(action["type"], action["t"])
+            self.indice += 1
+        if self.en_attente and self.fenetre.rendu_termine():
+            for type, instant in self.en_attente:
+                self.ajoute_latence(type, instant)
+            self.en_attente = []
+        if self.indice == len(self.actions) and not self.en_attente:
+            print(rapport_latences(self.latences))
+            self.fenetre.destroy()
+        else:
+            self.fenetre.after(Rejeu.periode_sondage, self.etape)
+
+    def execute(self, action):
+        "Exécution d'une action par les méthodes appelées par les callbacks correspondantes, avec des événements simulés"
+        canevas = self.fenetre.canevas
+        if action["type"] == "zoom":
+            pxa, pxb, pya, pyb = action["bornes"]
+            canevas.ajoute_bornes((pxa, pxb, pya, pyb))
+            self.fenetre.zoom_dezoom((pxa, pxb, pya), 1)
+        elif action["type"] == "retour":
+            canevas.retour(None)
+        elif action["type"] == "entree":
+            canevas.entree_canevas(None)
+        elif action["type"] == "survol":
+            canevas.survol_canevas(SimpleNamespace(x=action["x"], y=action["y"]))
+        elif action["type"] == "sortie":
+            canevas.sortie_canevas(None)
+        elif action["type"] == "molette":
+            canevas.molette(SimpleNamespace(x=action["x"], y=action["y"], num=4 if action["avant"] else 5, delta=0))
+        elif action["type"] == "redimensionnement":
+            canevas.configure(width=action["largeur"], height=action["hauteur"])
+            canevas.redimensionne(SimpleNamespace(width=action["largeur"], height=action["hauteur"]))
+
+    def ajoute_latence(self, type, instant):
+        self.latences.setdefault(type, []).append(time.perf_counter() - self.debut - instant)
+
+
+def rapport_latences(latences, centiles=(50, 90, 99)):
+    "Mise en forme des centiles (en millisecondes) des latences mesurées, par type d'action"
+    lignes = ["Latences (ms) :"]
+    for type, valeurs in sorted(latences.items()):
+        valeurs_ms = 1000 * np.array(valeurs)
+        resultats = ", ".join(f"p{c} = {np.percentile(valeurs_ms, c):.1f}" for c in centiles)
+        lignes.append(f"  {type} ({len(valeurs)} actions) : {resultats}, max = {valeurs_ms.max():.1f}")
+    return "\n".join(lignes)
+
 
 def precision(x1, x2, log=False):
     """Fonction utilitaire permettant de déterminer le nombre de chiffres à afficher
@@ -517,14 +1844,40 @@ def precision(x1, x2, log=False):
 
 #---------------------------------- Programme principal ----------------------------------#
 
+def affiche_estimations_aire(modele, precision, periode=10):
+    "Estimation de l'aire de l'ensemble dans la zone du modèle jusqu'à la précision demandée, avec affichage régulier en console"
+    print(f"Estimation de l'aire sur x = [{modele.zone.A.x}, {modele.zone.B.x}], y = [{modele.zone.B.y}, {modele.zone.A.y}] "
+          f"à {modele.n_iter} itérations (précision visée : {precision:.3g})")
+    debut = time.perf_counter()
+    estimation = EstimationAire(modele)
+    for num_lot, (aire, demi_largeur, nb_echantillons) in enumerate(estimation.estimations(precision), 1):
+        if num_lot % periode == 0:
+            print(f"  aire = {aire:.6f} ± {demi_largeur:.6f} ({nb_echantillons} échantillons)")
+    print(f"Aire estimée : {aire:.6f} ± {demi_largeur:.6f} (intervalle de confiance à 95 %, {nb_echantillons} échantillons, {time.perf_counter() - debut:.1f} s)")
+    print(f"  hors biais de troncature à {modele.n_iter} itérations (surestimation de l'aire, à réduire avec l'option '-n')")
+
 def help():
     print("""
-    Utilisation : ensemble_mandelbrot.py [-l <valeur_l>] [-h <valeur_h>] [-n <valeur_n>]
+    Utilisation : ensemble_mandelbrot.py [-l <valeur_l>] [-h <valeur_h>] [-n <valeur_n>] [-s <url>]
+                  ensemble_mandelbrot.py --aire [--precision <valeur_p>] [-n <valeur_n>]
+                  ensemble_mandelbrot.py --rejeu <script>
     -l, -h : largeur et hauteur du cadre de représentation en pixels
              si l'une des deux options est absente, la grandeur associée prend la valeur attribuée à l'autre option
              si les deux options sont absentes, largeur et hauteur prennent la valeur par défaut de 800 pixels
     -n : nombre d'itérations maximal dans le calcul de la suite définissant l'ensemble de Mandelbrot
-         valeur par défaut : 100 itérations
+         valeur par défaut : 100 itérations (10000 avec l'option '--aire')
+    -s : adresse d'un service de calcul local (voir service_Mandelbrot.py), par exemple http://127.0.0.1:8765
+         par défaut, les calculs sont faits par l'application elle-même
+    --aire : estimation de Monte-Carlo de l'aire de l'ensemble (sur x = [-2, 0.5], y = [-1.25, 1.25]), sans interface graphique
+    --precision : demi-largeur de l'intervalle de confiance à 95 % visée par l'option '--aire', valeur par défaut : 0.001
+                  l'intervalle ne tient pas compte du biais de troncature à n itérations, qui surestime l'aire
+                  (d'environ 0.04 à 100 itérations, de l'ordre de 0.001 à 10000 itérations)
+    --timing : affichage des durées des étapes du lancement (imports, création de la fenêtre, premier tracé, etc.)
+    --budget : durée maximale souhaitée (en secondes) du calcul de l'ensemble, au-delà de laquelle un avertissement est affiché
+    --reduction-auto : réduction automatique de la résolution des calculs dont la durée estimée dépasse le budget
+    --enregistre : enregistrement des interactions dans le script indiqué, sauvegardé à la fermeture de la fenêtre
+    --rejeu : rejeu du script indiqué (avec ses propres paramètres de lancement) et affichage des latences
+              des interactions ; sans écran, lancer sous un affichage virtuel (xvfb-run python ensemble_Mandelbrot.py ...)
     """)
 
 def help_exit():
@@ -536,13 +1889,21 @@ def main(argv):
 
     # Valeurs par défaut des paramètres
     largeur = hauteur = 800
-    n_iter = 100
+    n_iter = None  # 100 itérations pour l'interface, 10000 pour l'estimation de l'aire (biais de troncature)
+    service = None
+    aire = False
+    precision_aire = 1e-3
+    script_enregistrement = script_rejeu = None
+    budget = None
+    reduction_auto = False
+    chronometre = Chronometre(False, debut_imports)
+    chronometre.etape("imports")
     xa, ya = (-2.0, 1.5)  # point haut gauche 
     xb = 1.0              # abscisse du point bas droite
 
     # Récupération des options de la ligne de commande
     try:
-        options_et_valeurs, _ = getopt.getopt(argv, "n:l:h:", ["help"])
+        options_et_valeurs, _ = getopt.getopt(argv, "n:l:h:s:", ["help", "aire", "precision=", "enregistre=", "rejeu=", "timing", "budget=", "reduction-auto"])
     except getopt.GetoptError as err:
         print(err)
         help_exit()
@@ -574,9 +1935,57 @@ def main(argv):
             except:
                 print("Mauvaise valeur pour l'option '-n'")
                 help_exit()
+        elif option == '-s':
+            service = valeur
+        elif option == '--aire':
+            aire = True
+        elif option == '--precision':
+            try:
+                precision_aire = float(valeur)
+            except:
+                print("Mauvaise valeur pour l'option '--precision'")
+                help_exit()
+        elif option == '--enregistre':
+            script_enregistrement = valeur
+        elif option == '--rejeu':
+            script_rejeu = valeur
+        elif option == '--timing':
+            chronometre.actif = True
+        elif option == '--budget':
+            try:
+                budget = float(valeur)
+            except:
+                print("Mauvaise valeur pour l'option '--budget'")
+                help_exit()
+        elif option == '--reduction-auto':
+            reduction_auto = True
+
+    # Estimation de l'aire, sans interface graphique
+    if aire:
+        affiche_estimations_aire(Mandelbrot(1, 1, -2.0, 0.5, 1.25, 10000 if n_iter is None else n_iter), precision_aire)
+        return
+    if n_iter is None:
+        n_iter = 100
+
+    # Rejeu d'un script d'interactions, avec les paramètres de lancement enregistrés
+    if script_rejeu is not None:
+        import json
+        with open(script_rejeu) as fichier:
+            script = json.load(fichier)
+        fenetre = Fenetre(script["largeur"], script["hauteur"], script["xa"], script["xb"], script["ya"], script["n_iter"], service,
+                          budget=budget, reduction_auto=reduction_auto)
+        chronometre.etape("création de la fenêtre")
+        Rejeu(fenetre, script["actions"]).lance()
+        fenetre.lancement(chronometre)
+        return
 
     # Lancement de l'application
-    Fenetre(largeur, hauteur, xa, xb, ya, n_iter).lancement()
+    enregistreur = None
+    if script_enregistrement is not None:
+        enregistreur = Enregistreur(script_enregistrement, largeur, hauteur, xa, xb, ya, n_iter)
+    fenetre = Fenetre(largeur, hauteur, xa, xb, ya, n_iter, service, enregistreur, budget, reduction_auto)
+    chronometre.etape("création de la fenêtre")
+    fenetre.lancement(chronometre)
 
 
 if __name__ == "__main__":
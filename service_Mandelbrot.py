@@ -0,0 +1,299 @@
+import json
+import math
+import queue
+import threading
+import sys, getopt
+from collections import OrderedDict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import numpy as np
+
+from ensemble_Mandelbrot import Mandelbrot
+
+
+#---------------------------------------- Service ----------------------------------------#
+
+class Tache():
+    """Classe d'une demande de calcul de l'ensemble de Mandelbrot.
+
+    Une tâche est identifiée par sa clé (bornes, dimensions et nombre d'itérations) : des demandes
+    identiques arrivant pendant son calcul attendent la même tâche au lieu d'en créer une nouvelle.
+    """
+
+    def __init__(self, cle):
+        self.cle = cle
+        self.xa, self.xb, self.ya, self.largeur, self.hauteur, self.n_iter = cle
+        self.termine = threading.Event()
+        self.ensemble = None
+        self.erreur = None
+
+    def nb_pixels(self):
+        return self.largeur * self.hauteur
+
+
+class ServiceMandelbrot():
+    """Service de calcul de l'ensemble de Mandelbrot partagé entre plusieurs clients.
+
+    Le service possède :
+    - une file de tâches traitées par un ensemble de fils d'exécution (travailleurs)
+    - un cache des derniers ensembles calculés (du plus ancien au plus récent utilisé), limité en octets
+      pour que sa mémoire reste bornée quelle que soit la taille des demandes
+    - un dictionnaire des tâches en cours, pour ne calculer qu'une fois des demandes identiques simultanées
+
+    Les petites tâches de même nombre d'itérations sont regroupées en lots calculés en une seule
+    passe matricielle, ce qui évite de payer le coût de la boucle d'itération pour chacune.
+
+    Les paramètres des demandes sont vérifiés avant leur mise en file (voir verifie_demande) : une
+    demande invalide est refusée sans être calculée, ni regroupée avec celles d'autres clients.
+    """
+
+    def __init__(self, nb_travailleurs=2, octets_cache=256*2**20, pixels_petite_tache=128*128, pixels_lot=512*512, pixels_max=4096*4096):
+        self.file = queue.Queue()
+        self.cache = OrderedDict()
+        self.octets_cache = octets_cache    # taille maximale du cache
+        self.octets_caches = 0              # taille des ensembles en cache
+        self.en_cours = {}
+        self.verrou = threading.Lock()
+        self.pixels_petite_tache = pixels_petite_tache  # taille maximale d'une tâche pouvant être regroupée
+        self.pixels_lot = pixels_lot                    # taille maximale d'un lot
+        self.pixels_max = pixels_max                    # taille maximale d'une demande
+        self.nb_calculs = 0  # nombre de passes de calcul effectuées (une par lot)
+        self.travailleurs = [threading.Thread(target=self.travailleur, daemon=True) for _ in range(nb_travailleurs)]
+        for travailleur in self.travailleurs:
+            travailleur.start()
+
+    def rendu(self, xa, xb, ya, largeur, hauteur, n_iter):
+        """Méthode bloquante renvoyant l'ensemble de Mandelbrot demandé, depuis le cache, depuis une
+        tâche identique en cours ou à l'issue d'une nouvelle tâche.
+        """
+        cle = self.verifie_demande(xa, xb, ya, largeur, hauteur, n_iter)
+        with self.verrou:
+            if cle in self.cache:
+                self.cache.move_to_end(cle)
+                return self.cache[cle]
+            tache = self.en_cours.get(cle)
+            if tache is None:
+                tache = Tache(cle)
+                self.en_cours[cle] = tache
+                self.file.put(tache)
+        tache.termine.wait()
+        if tache.erreur is not None:
+            raise tache.erreur
+        return tache.ensemble
+
+    def verifie_demande(self, xa, xb, ya, largeur, hauteur, n_iter):
+        "Vérification des paramètres d'une demande, renvoyant sa clé ; lève ValueError si une demande est invalide"
+        for nom, valeur in (("largeur", largeur), ("hauteur", hauteur), ("n_iter", n_iter)):
+            if not isinstance(valeur, int) or isinstance(valeur, bool) or valeur <= 0:
+                raise ValueError(f"'{nom}' doit être un entier strictement positif")
+        if largeur * hauteur > self.pixels_max:
+            raise ValueError(f"L'image demandée dépasse {self.pixels_max} pixels")
+        for nom, valeur in (("xa", xa), ("xb", xb), ("ya", ya)):
+            if not isinstance(valeur, (int, float)) or isinstance(valeur, bool) or not math.isfinite(valeur):
+                raise ValueError(f"'{nom}' doit être un nombre fini")
+        if not xb > xa:
+            raise ValueError("'xb' doit être supérieur à 'xa'")
+        return (float(xa), float(xb), float(ya), largeur, hauteur, n_iter)
+
+    def travailleur(self):
+        "Boucle d'un fil d'exécution travailleur : récupération d'une tâche, ou d'un lot de petites tâches, et calcul"
+        while True:
+            lot = [self.file.get()]
+            if lot[0].nb_pixels() <= self.pixels_petite_tache:
+                lot += self.complete_lot(lot[0])
+            try:
+                self.calcule_lot(lot)
+            except Exception as erreur:
+                for tache in lot:
+                    tache.erreur = erreur
+            self.termine_lot(lot)
+
+    def complete_lot(self, premiere):
+        """Récupération sans attente des petites tâches en file de même nombre d'itérations que la première
+        tâche du lot, dans la limite de la taille d'un lot. Les autres tâches sont remises en file.
+        """
+        ajoutees, reportees = [], []
+        nb_pixels = premiere.nb_pixels()
+        while nb_pixels < self.pixels_lot:
+            try:
+                tache = self.file.get_nowait()
+            except queue.Empty:
+                break
+            if tache.n_iter == premiere.n_iter and tache.nb_pixels() <= self.pixels_petite_tache:
+                ajoutees.append(tache)
+                nb_pixels += tache.nb_pixels()
+            else:
+                reportees.append(tache)
+        for tache in reportees:
+            self.file.put(tache)
+        return ajoutees
+
+    def calcule_lot(self, lot):
+        """Calcul des ensembles d'un lot. Une tâche seule est calculée normalement (avec exploitation de la
+        symétrie), plusieurs tâches le sont en une seule passe sur la concaténation de leurs valeurs de c.
+        """
+        modeles = [Mandelbrot(t.largeur, t.hauteur, t.xa, t.xb, t.ya, t.n_iter) for t in lot]
+        if len(lot) == 1:
+            modeles[0].calcul_ensemble()
+            lot[0].ensemble = modeles[0].ensemble
+        else:
+            for tache, ensemble in zip(lot, modeles[0].calcul_ensembles([m.zone for m in modeles])):
+                tache.ensemble = ensemble
+        with self.verrou:
+            self.nb_calculs += 1
+
+    def termine_lot(self, lot):
+        "Mise en cache des résultats (en supprimant les plus anciens au-delà de la taille du cache) et libération des clients"
+        with self.verrou:
+            for tache in lot:
+                del self.en_cours[tache.cle]
+                if tache.erreur is None and tache.cle not in self.cache:
+                    self.cache[tache.cle] = tache.ensemble
+                    self.octets_caches += tache.ensemble.nbytes
+                    while self.octets_caches > self.octets_cache:
+                        _, ensemble = self.cache.popitem(last=False)
+                        self.octets_caches -= ensemble.nbytes
+        for tache in lot:
+            tache.termine.set()
+
+    def etat(self):
+        with self.verrou:
+            return {"cache": len(self.cache), "octets_cache": self.octets_caches, "en_cours": len(self.en_cours), "file": self.file.qsize(), "calculs": self.nb_calculs}
+
+
+#---------------------------------------- Protocole ----------------------------------------#
+
+formats = ("octets", "bits")
+
+def encode_ensemble(ensemble, format):
+    """Conversion d'un ensemble en tampon brut : un octet par pixel (format 'octets') ou un bit par pixel
+    (format 'bits'), ligne par ligne"""
+    if format == "octets":
+        return ensemble.astype(np.uint8).tobytes()
+    elif format == "bits":
+        return np.packbits(ensemble).tobytes()
+    raise ValueError(f"Format inconnu : {format}")
+
+def decode_ensemble(donnees, format, largeur, hauteur):
+    "Conversion inverse de celle de la fonction encode_ensemble"
+    tampon = np.frombuffer(donnees, dtype=np.uint8)
+    if format == "octets":
+        return tampon.reshape(hauteur, largeur).astype(bool)
+    elif format == "bits":
+        return np.unpackbits(tampon, count=largeur*hauteur).reshape(hauteur, largeur).astype(bool)
+    raise ValueError(f"Format inconnu : {format}")
+
+
+class GestionnaireRequetes(BaseHTTPRequestHandler):
+    """Gestionnaire des requêtes HTTP adressées au service :
+    - POST /rendu avec un corps JSON {xa, xb, ya, largeur, hauteur, n_iter, format} : ensemble demandé
+      sous forme de tampon brut (voir encode_ensemble), dimensions rappelées dans les en-têtes
+    - GET /etat : état du service au format JSON
+    Une demande invalide reçoit une erreur 400 et une erreur inattendue du calcul une erreur 500.
+    """
+
+    def do_POST(self):
+        if self.path != "/rendu":
+            self.send_error(404)
+            return
+        try:
+            demande = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            format = demande.get("format", "bits")
+            if format not in formats:
+                raise ValueError(f"Format inconnu : {format}")
+            ensemble = self.server.service.rendu(demande["xa"], demande["xb"], demande["ya"],
+                                                 demande["largeur"], demande["hauteur"], demande["n_iter"])
+            donnees = encode_ensemble(ensemble, format)
+        except (ValueError, KeyError, TypeError, AttributeError) as erreur:
+            self.send_error(400, str(erreur))
+            return
+        except Exception as erreur:
+            self.send_error(500, str(erreur))
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(len(donnees)))
+        self.send_header("X-Largeur", str(ensemble.shape[1]))
+        self.send_header("X-Hauteur", str(ensemble.shape[0]))
+        self.send_header("X-Format", format)
+        self.end_headers()
+        self.wfile.write(donnees)
+
+    def do_GET(self):
+        if self.path != "/etat":
+            self.send_error(404)
+            return
+        donnees = json.dumps(self.server.service.etat()).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(donnees)))
+        self.end_headers()
+        self.wfile.write(donnees)
+
+    def log_message(self, format, *args):
+        pass  # pas de journal pour chaque requête
+
+
+def cree_serveur(port, nb_travailleurs=2):
+    "Création d'un serveur HTTP local (n'écoutant que sur 127.0.0.1) associé à un service de calcul"
+    serveur = ThreadingHTTPServer(("127.0.0.1", port), GestionnaireRequetes)
+    serveur.daemon_threads = True
+    serveur.service = ServiceMandelbrot(nb_travailleurs)
+    return serveur
+
+
+#---------------------------------- Programme principal ----------------------------------#
+
+def help():
+    print("""
+    Utilisation : service_Mandelbrot.py [-p <port>] [-t <nb_travailleurs>]
+    -p : port d'écoute du service sur 127.0.0.1, valeur par défaut : 8765
+    -t : nombre de fils d'exécution de calcul, valeur par défaut : 2
+    Les clients (par exemple ensemble_Mandelbrot.py -s http://127.0.0.1:8765) partagent le cache et les travailleurs du service.
+    """)
+
+def help_exit():
+    help()
+    sys.exit(2)
+
+
+def main(argv):
+
+    # Valeurs par défaut des paramètres
+    port = 8765
+    nb_travailleurs = 2
+
+    # Récupération des options de la ligne de commande
+    try:
+        options_et_valeurs, _ = getopt.getopt(argv, "p:t:", ["help"])
+    except getopt.GetoptError as err:
+        print(err)
+        help_exit()
+
+    # Récupération des valeurs
+    for option, valeur in options_et_valeurs:
+        if option == "--help":
+            help_exit()
+        elif option == '-p':
+            try:
+                port = int(valeur)
+            except:
+                print("Mauvaise valeur pour l'option '-p'")
+                help_exit()
+        elif option == '-t':
+            try:
+                nb_travailleurs = int(valeur)
+            except:
+                print("Mauvaise valeur pour l'option '-t'")
+                help_exit()
+
+    # Lancement du service
+    serveur = cree_serveur(port, nb_travailleurs)
+    print(f"Service de calcul à l'écoute sur http://127.0.0.1:{serveur.server_address[1]}")
+    try:
+        serveur.serve_forever()
+    except KeyboardInterrupt:
+        serveur.server_close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,28 @@
+from ensemble_Mandelbrot import Mandelbrot, EstimationAire
+
+def test_zone_interieure_et_zone_exterieure():
+    # Zone incluse dans la cardioïde principale : aire de la zone, sans variance
+    estimation = EstimationAire(Mandelbrot(1, 1, -0.2, 0.0, 0.1, 100), nb_processus=1, graine=0)
+    aire, demi_largeur, _ = list(estimation.estimations(nb_max_lots=3))[-1]
+    assert abs(aire - 0.04) < 1e-12 and demi_largeur < 1e-12
+    # Zone extérieure au disque de rayon 2 : aire nulle
+    estimation = EstimationAire(Mandelbrot(1, 1, 2.5, 3.0, 0.5, 100), nb_processus=1, graine=0)
+    aire, demi_largeur, _ = list(estimation.estimations(nb_max_lots=3))[-1]
+    assert aire == 0 and demi_largeur == 0
+
+def test_aire_ensemble_complet():
+    # Aire de référence : 1.5066 (la valeur à n_iter itérations est légèrement supérieure)
+    estimation = EstimationAire(Mandelbrot(1, 1, -2.0, 0.5, 1.25, 1000), nb_processus=1, graine=0)
+    aire, demi_largeur, nb_echantillons = list(estimation.estimations(precision=5e-3))[-1]
+    assert demi_largeur <= 5e-3 and estimation.nb_lots >= EstimationAire.nb_min_lots
+    assert nb_echantillons == estimation.nb_lots * 100 * 100
+    assert 1.5066 - demi_largeur < aire < 1.5066 + demi_largeur + 0.01
+
+def test_nombre_d_iterations_de_l_option_aire(monkeypatch):
+    # Biais de troncature : 10000 itérations par défaut pour '--aire', sauf valeur explicite de '-n'
+    import ensemble_Mandelbrot
+    modeles = []
+    monkeypatch.setattr(ensemble_Mandelbrot, "affiche_estimations_aire", lambda modele, precision: modeles.append(modele))
+    ensemble_Mandelbrot.main(["--aire"])
+    ensemble_Mandelbrot.main(["--aire", "-n", "500"])
+    assert [modele.n_iter for modele in modeles] == [10000, 500]
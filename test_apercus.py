@@ -0,0 +1,69 @@
+import time
+import numpy as np
+from ensemble_Mandelbrot import Mandelbrot, Zone
+
+def test_apercu_redimensionnement_rogne_et_complete():
+    # Objet et ensemble de Mandelbrot
+    mandelbrot = Mandelbrot(200, 200, -2.0, 1.0, 1.5, 100)
+    mandelbrot.calcul_ensemble()
+    # Rognage en largeur, extension en hauteur
+    apercu = mandelbrot.apercu(0, 0, 1, 150, 250)
+    assert apercu.shape == (250, 150)
+    assert (apercu[:200] == mandelbrot.ensemble[:, :150]).all()
+    assert not apercu[200:].any()
+
+def test_apercu_zoom_facteur_2():
+    mandelbrot = Mandelbrot(200, 200, -2.0, 1.0, 1.5, 100)
+    mandelbrot.calcul_ensemble()
+    # Cadre de zoom (50, 150, 50, 150) : chaque pixel de l'ensemble courant est dupliqué en 2 x 2 pixels
+    apercu = mandelbrot.apercu(50, 50, 0.5, 200, 200)
+    assert (apercu == np.repeat(np.repeat(mandelbrot.ensemble[50:150, 50:150], 2, axis=0), 2, axis=1)).all()
+
+def test_redimensionnement_zone_egal_calcul_direct():
+    # Zone redimensionnée : même point A, même échelle
+    mandelbrot = Mandelbrot(200, 200, -2.0, 1.0, 1.5, 100)
+    mandelbrot.redimensionne(300, 100)
+    mandelbrot.calcul_ensemble()
+    reference = Mandelbrot(300, 100, -2.0, -2.0 + 300 * 3.0 / 200, 1.5, 100)
+    reference.calcul_ensemble()
+    assert np.isclose(mandelbrot.zone.B.y, reference.zone.B.y)
+    assert (mandelbrot.ensemble == reference.ensemble).all()
+    # Réduction : les matrices de pixels sont des vues sur les précédentes
+    im_pix = mandelbrot.zone.im_pix
+    mandelbrot.redimensionne(100, 50)
+    assert np.shares_memory(mandelbrot.zone.im_pix.mat_px, im_pix.mat_px)
+
+def test_calcul_ensembles_egal_calculs_individuels():
+    # Vignettes de tailles différentes calculées en une seule passe
+    mandelbrot = Mandelbrot(64, 64, -2.0, 1.0, 1.5, 100)
+    zones = [Mandelbrot(64, 64 - i, -2.0 + 0.05*i, 1.0 - 0.03*i, 1.2 - 0.04*i, 100).zone for i in range(50)]
+    ensembles = mandelbrot.calcul_ensembles(zones)
+    assert len(ensembles) == 50
+    for zone, ensemble in zip(zones, ensembles):
+        reference = Mandelbrot(zone.im_pix.largeur, zone.im_pix.hauteur, zone.A.x, zone.B.x, zone.A.y, 100)
+        reference.calcul_ensemble()
+        assert (ensemble == reference.ensemble).all()
+
+def meilleure_duree(fonction, nb_essais=3):
+    durees = []
+    for _ in range(nb_essais):
+        debut = time.perf_counter()
+        fonction()
+        durees.append(time.perf_counter() - debut)
+    return min(durees)
+
+def test_cout_de_cinquante_vignettes():
+    # Historique de 50 zooms successifs vers un point de la frontière, en vignettes de 64 x 64 pixels
+    zones, xa, xb, ya = [], -2.0, 1.0, 1.5
+    for _ in range(50):
+        zones.append(Zone(64, 64, xa, xb, ya))
+        xa, xb, ya = xa + (-0.7436 - xa) * 0.2, xa + (-0.7436 - xa) * 0.2 + (xb - xa) * 0.8, ya + (0.1318 - ya) * 0.2
+    mandelbrot = Mandelbrot(64, 64, -2.0, 1.0, 1.5, 1000)
+    duree_lot = meilleure_duree(lambda: mandelbrot.calcul_ensembles(zones))
+    # Plus rapide qu'un calcul par zone...
+    duree_zones = meilleure_duree(lambda: [Mandelbrot(64, 64, z.A.x, z.B.x, z.A.y, 1000).calcul_ensemble(en_parallele=False) for z in zones])
+    assert duree_lot < duree_zones
+    # ... et pas plus coûteux qu'une image du même nombre de pixels sur la zone la plus profonde
+    zone = zones[-1]
+    image = Mandelbrot(453, 453, zone.A.x, zone.B.x, zone.A.y, 1000)
+    assert duree_lot < meilleure_duree(lambda: image.calcul_ensemble(en_parallele=False))
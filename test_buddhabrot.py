@@ -0,0 +1,52 @@
+import numpy as np
+from ensemble_Mandelbrot import Mandelbrot, Buddhabrot
+
+def test_echantillons_hors_interieur():
+    # Aucune valeur de c tirée à l'intérieur des disques |c| < 1/4 et |c + 1| < 1/4, inclus dans l'ensemble
+    # (marge de trois cellules, une cellule n'étant rejetée que si ses voisines sont aussi dans l'ensemble)
+    mandelbrot = Mandelbrot(100, 100, -2.0, 1.0, 1.5, 100)
+    buddhabrot = Buddhabrot(mandelbrot.zone, 100, graine=0)
+    c, ponderation = buddhabrot.echantillonne()
+    marge = 3 * buddhabrot.cote_cellule
+    assert not ((np.abs(c) < 0.25 - marge) | (np.abs(c + 1) < 0.25 - marge)).any()
+    assert (ponderation > 0).all()
+
+def test_memoire_bornee_et_accumulation():
+    mandelbrot = Mandelbrot(120, 80, -2.0, 1.0, 1.5, 100)
+    buddhabrot = Buddhabrot(mandelbrot.zone, 100, taille_lot=5000, graine=0)
+    for _ in range(3):
+        buddhabrot.calcul_lot()
+    assert buddhabrot.nb_echantillons == 15000
+    assert buddhabrot.histogramme.shape == (120 * 80,)
+    assert buddhabrot.histogramme.sum() > 0
+    image = buddhabrot.image()
+    assert image.shape == (80, 120) and image.dtype == np.uint8 and image.max() == 255
+
+def test_probabilites_de_tirage_calculees_une_fois():
+    zone = Mandelbrot(100, 100, -2.0, 1.0, 1.5, 100).zone
+    premier, second = Buddhabrot(zone, 100, graine=0), Buddhabrot(zone.copie(), 100, graine=1)
+    assert second.cumul_poids is premier.cumul_poids and second.ponderation is premier.ponderation
+    assert Buddhabrot(zone, 200).cumul_poids is not premier.cumul_poids
+
+def densites_par_lot(buddhabrot, nb_lots):
+    # Densité des orbites par échantillon tiré, pour chaque lot
+    densites = []
+    for _ in range(nb_lots):
+        avant = buddhabrot.histogramme.copy()
+        buddhabrot.calcul_lot()
+        densites.append((buddhabrot.histogramme - avant) / buddhabrot.taille_lot)
+    return np.array(densites)
+
+def test_densite_egale_a_celle_d_un_tirage_uniforme():
+    # Le tirage préférentiel pondéré donne la même densité qu'un tirage uniforme sur [-2, 2] x [-2, 2],
+    # aux fluctuations près (écart inférieur à 4 écarts-types dans chaque pixel d'une image de 4 x 4 pixels)
+    zone = Mandelbrot(4, 4, -2.0, 1.0, 1.5, 100).zone
+    preferentiel = densites_par_lot(Buddhabrot(zone, 100, graine=0), 30)
+    buddhabrot = Buddhabrot(zone, 100, graine=1)
+    def tirage_uniforme():
+        x, y = buddhabrot.generateur.uniform(-2, 2, (2, buddhabrot.taille_lot))
+        return x + 1j * y, np.ones(buddhabrot.taille_lot)
+    buddhabrot.echantillonne = tirage_uniforme
+    uniforme = densites_par_lot(buddhabrot, 30)
+    ecart_type = np.sqrt(preferentiel.var(axis=0, ddof=1) / 30 + uniforme.var(axis=0, ddof=1) / 30)
+    assert (np.abs(preferentiel.mean(axis=0) - uniforme.mean(axis=0)) < 4 * ecart_type).all()
@@ -0,0 +1,48 @@
+from ensemble_Mandelbrot import Mandelbrot, CacheVues, image_pgm, ensemble_pgm
+import numpy as np
+import os
+
+def test_aller_retour_pgm():
+    mandelbrot = Mandelbrot(120, 80, -2.0, 1.0, 1.5, 100)
+    mandelbrot.calcul_ensemble()
+    donnees = image_pgm(np.where(mandelbrot.ensemble, 0, 255))
+    assert donnees.startswith(b"P5 120 80 255 ")
+    assert (ensemble_pgm(donnees) == mandelbrot.ensemble).all()
+
+def test_cache_lecture_ecriture(tmp_path):
+    cache = CacheVues(str(tmp_path / "cache"))
+    cle = (-2.0, 1.0, 1.5, 2, 1, 100)
+    assert cache.lit(cle) is None
+    cache.ecrit(cle, b"P5 2 1 255 \x00\xff")
+    assert cache.lit(cle) == b"P5 2 1 255 \x00\xff"
+    assert cache.lit((-2.0, 1.0, 1.5, 2, 1, 200)) is None
+    assert [f.name for f in (tmp_path / "cache").iterdir()] == [os.path.basename(cache.chemin(cle))]
+
+def test_cache_inaccessible(tmp_path):
+    # Un cache non accessible en écriture est ignoré
+    fichier = tmp_path / "fichier"
+    fichier.write_text("")
+    cache = CacheVues(str(fichier / "cache"))
+    cache.ecrit((-2.0, 1.0, 1.5, 800, 800, 100), b"P5 1 1 255 \x00")
+    assert cache.lit((-2.0, 1.0, 1.5, 800, 800, 100)) is None
+
+def test_cache_fichier_corrompu(tmp_path):
+    # Un fichier tronqué ou d'en-tête incorrect est ignoré et supprimé
+    cache = CacheVues(str(tmp_path))
+    cle = (-2.0, 1.0, 1.5, 2, 2, 100)
+    for donnees in (b"P5 2 2 255 \x00\xff\x00", b"P5 2 3 255 \x00\xff\x00\xff", b"P5 2", b""):
+        with open(cache.chemin(cle), "wb") as fichier:
+            fichier.write(donnees)
+        assert cache.lit(cle) is None
+        assert not os.path.exists(cache.chemin(cle))
+
+def test_premier_calcul_sans_fils_d_execution(monkeypatch):
+    # Le premier tracé est calculé dans le fil appelant, sans créer les fils d'exécution partagés
+    monkeypatch.setattr(Mandelbrot, "executeur", None)
+    monkeypatch.setattr(Mandelbrot, "duree_min_tuiles", 0.0)
+    sequentiel = Mandelbrot(400, 300, -2.0, 1.0, 1.2, 100)
+    sequentiel.calcul_ensemble(en_parallele=False)
+    assert Mandelbrot.executeur is None
+    parallele = Mandelbrot(400, 300, -2.0, 1.0, 1.2, 100)
+    parallele.calcul_ensemble()
+    assert (sequentiel.ensemble == parallele.ensemble).all()
@@ -0,0 +1,111 @@
+import threading
+import time
+import numpy as np
+from ensemble_Mandelbrot import Mandelbrot
+
+def calcul_ensemble_complet(mandelbrot):
+    # Calcul de référence sur toutes les lignes, sans découpage en tuiles ni raccourci
+    zone = mandelbrot.zone
+    c = zone.pix_to_x(zone.im_pix.mat_px) + 1j * zone.pix_to_y(zone.im_pix.mat_py)
+    z = np.zeros(c.shape, dtype=complex)
+    for n in range(mandelbrot.n_iter):
+        z = z*z + c
+    return np.abs(z) < 2
+
+def test_calcul_par_tuiles_identique_au_calcul_complet(monkeypatch):
+    monkeypatch.setattr(Mandelbrot, "duree_min_tuiles", 0.0)
+    # Zone hors de l'axe réel (pas de symétrie), découpée en tuiles incomplètes sur les bords
+    mandelbrot = Mandelbrot(300, 200, -0.8, -0.6, 0.5)
+    mandelbrot.calcul_ensemble()
+    assert (mandelbrot.ensemble == calcul_ensemble_complet(mandelbrot)).all()
+
+def test_suivi_de_l_avancement(monkeypatch):
+    monkeypatch.setattr(Mandelbrot, "duree_min_tuiles", 0.0)
+    avancements = []
+    mandelbrot = Mandelbrot(300, 300, -2.0, 1.0, 1.5)
+    mandelbrot.calcul_ensemble(lambda avancement, restant: avancements.append((avancement, restant)))
+    assert avancements[0][0] == 0.0 and avancements[0][1] is not None
+    assert avancements[-1] == (1.0, 0.0) and mandelbrot.progression == (1.0, 0.0)
+    assert all(a <= b for (a, _), (b, _) in zip(avancements, avancements[1:]))
+    assert len(avancements) > 2  # une étape par tuile
+
+def test_calcul_court_en_une_passe():
+    # Calcul estimé court : une seule passe, suivi au début et à la fin seulement
+    avancements = []
+    mandelbrot = Mandelbrot(300, 300, -2.0, 1.0, 1.5)
+    mandelbrot.calcul_ensemble(lambda avancement, restant: avancements.append((avancement, restant)))
+    assert len(avancements) == 2 and avancements[-1] == (1.0, 0.0)
+    assert (mandelbrot.ensemble == calcul_ensemble_complet(mandelbrot)).all()
+
+def test_estimation_des_couts():
+    mandelbrot = Mandelbrot(256, 256, -2.0, 1.0, 1.5)
+    tuiles = [(0, 128, 0, 128), (0, 128, 128, 256)]
+    couts, tours = mandelbrot.estimation_couts(0, tuiles)
+    # La tuile de droite contient la cardioïde, bien plus coûteuse que la tuile de gauche
+    assert len(couts) == 2 and couts[1] > couts[0] > 0
+    assert 0 < tours[0] <= tours[1] <= mandelbrot.n_iter
+    exact = mandelbrot.nb_iterations(mandelbrot.zone.grille(slice(0, 128))).sum()
+    assert 0.5 < sum(couts) / (exact + Mandelbrot.cout_fixe_pixel * 128 * 256) < 2
+
+def test_reduction_automatique_au_dela_du_budget():
+    mandelbrot = Mandelbrot(300, 200, -2.0, 1.0, 1.0, budget=1e-9, reduction_auto=True)
+    mandelbrot.calcul_ensemble()
+    assert mandelbrot.reduction > 1
+    assert mandelbrot.ensemble.shape == (200, 300)
+    # Chaque bloc de pixels reproduit le pixel calculé
+    r = mandelbrot.reduction
+    assert (mandelbrot.ensemble[:r, :r] == mandelbrot.ensemble[0, 0]).all()
+
+def test_budget_sans_reduction():
+    mandelbrot = Mandelbrot(300, 200, -0.8, -0.6, 0.5, budget=1e-9)
+    mandelbrot.calcul_ensemble()
+    assert mandelbrot.reduction == 1
+    assert (mandelbrot.ensemble == calcul_ensemble_complet(mandelbrot)).all()
+
+def test_reduction_remise_a_un():
+    # Un calcul en une seule tuile après un calcul réduit ne conserve pas l'ancien facteur de réduction
+    mandelbrot = Mandelbrot(300, 200, -2.0, 1.0, 1.0, budget=1e-9, reduction_auto=True)
+    mandelbrot.calcul_ensemble()
+    assert mandelbrot.reduction > 1
+    mandelbrot.budget = None
+    mandelbrot.redimensionne(100, 100)
+    mandelbrot.calcul_ensemble()
+    assert mandelbrot.reduction == 1
+
+def test_reduction_selon_le_budget(monkeypatch):
+    monkeypatch.setattr(Mandelbrot, "secondes_par_unite", 1e-8)
+    monkeypatch.setattr(Mandelbrot, "secondes_par_tour", 1e-5)
+    mandelbrot = Mandelbrot(800, 800, -2.0, 1.0, 1.5, 1000)
+    cout, tours = 1e7, 1000
+    # Budget couvrant la durée estimée du calcul complet : pas de réduction
+    mandelbrot.budget = mandelbrot.duree_estimee(cout, tours)
+    assert mandelbrot.reduction_budget(cout, tours) == 1
+    # Budget près de quatre fois plus faible pour les itérations : réduction d'un facteur 2
+    mandelbrot.budget = cout * Mandelbrot.secondes_par_unite / 3.9 + tours * Mandelbrot.secondes_par_tour
+    assert mandelbrot.reduction_budget(cout, tours) == 2
+    # Budget inférieur à la durée fixe des tours de boucle : réduction maximale
+    mandelbrot.budget = tours * Mandelbrot.secondes_par_tour / 2
+    assert mandelbrot.reduction_budget(cout, tours) == Mandelbrot.reduction_max
+
+def test_arret_des_iterations_sans_suite_active():
+    # Zone entièrement hors de l'ensemble : la boucle s'arrête bien avant n_iter
+    mandelbrot = Mandelbrot(64, 64, 0.5, 1.5, 1.5, 100000)
+    assert mandelbrot.nb_iterations(mandelbrot.zone.grille()).max() < 100
+    mandelbrot.calcul_ensemble()
+    assert not mandelbrot.ensemble.any()
+
+def test_arret_des_calculs(monkeypatch):
+    # Interruption du calcul et annulation des tuiles en attente (fermeture de la fenêtre) : fin rapide
+    monkeypatch.setattr(Mandelbrot, "duree_min_tuiles", 0.0)
+    monkeypatch.setattr(Mandelbrot, "executeur", None)
+    mandelbrot = Mandelbrot(1200, 1200, -0.75, -0.74, 0.105, 100000)
+    fil = threading.Thread(target=mandelbrot.calcul_ensemble)
+    fil.start()
+    while Mandelbrot.executeur is None:  # attente du début du calcul des tuiles
+        time.sleep(0.01)
+    instant = time.perf_counter()
+    mandelbrot.interrompu = True
+    Mandelbrot.arrete_executeur()
+    fil.join(5)
+    assert not fil.is_alive() and time.perf_counter() - instant < 1
+    assert mandelbrot.ensemble is None and Mandelbrot.executeur is None
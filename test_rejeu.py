@@ -0,0 +1,96 @@
+import json
+from types import SimpleNamespace
+from ensemble_Mandelbrot import CanvasMandel, Enregistreur, Rejeu, rapport_latences
+
+def test_enregistrement_script(tmp_path):
+    chemin = tmp_path / "script.json"
+    enregistreur = Enregistreur(str(chemin), 400, 300, -2.0, 1.0, 1.5, 100)
+    enregistreur.ajoute("survol", x=10, y=20)
+    enregistreur.ajoute("zoom", bornes=[10, 110, 20, 95])
+    enregistreur.ajoute("retour")
+    enregistreur.sauve()
+    script = json.loads(chemin.read_text())
+    assert (script["largeur"], script["hauteur"], script["n_iter"]) == (400, 300, 100)
+    assert [action["type"] for action in script["actions"]] == ["survol", "zoom", "retour"]
+    assert script["actions"][1]["bornes"] == [10, 110, 20, 95]
+    assert script["actions"][0]["t"] <= script["actions"][1]["t"] <= script["actions"][2]["t"]
+
+def test_rapport_latences():
+    rapport = rapport_latences({"zoom": [0.1, 0.2, 0.3], "survol": [0.001]})
+    lignes = rapport.splitlines()
+    assert lignes[1] == "  survol (1 actions) : p50 = 1.0, p90 = 1.0, p99 = 1.0, max = 1.0"
+    assert lignes[2].startswith("  zoom (3 actions) : p50 = 200.0, p90 = 280.0")
+
+def test_origine_des_instants_au_demarrage(tmp_path):
+    # La durée écoulée avant le démarrage (création de la fenêtre, premier tracé) n'est pas comptée
+    enregistreur = Enregistreur(str(tmp_path / "script.json"), 400, 300, -2.0, 1.0, 1.5, 100)
+    enregistreur.debut -= 10.0
+    enregistreur.demarre()
+    enregistreur.ajoute("retour")
+    assert enregistreur.actions[0]["t"] < 1.0
+
+class FenetreFactice():
+    # Fenêtre réduite à ce qu'utilise Rejeu : boucle d'événements simulée par une liste d'appels planifiés,
+    # calcul exact en arrière-plan terminé après un nombre donné de sondages
+    def __init__(self, nb_sondages_rendu):
+        self.planifies = []
+        self.canevas = self
+        self.appels = []
+        self.nb_sondages_rendu = nb_sondages_rendu
+        self.detruite = False
+
+    def after(self, delai, fonction, *arguments):
+        self.planifies.append((fonction, arguments))
+
+    def update_idletasks(self):
+        pass
+
+    def rendu_termine(self):
+        self.nb_sondages_rendu -= 1
+        return self.nb_sondages_rendu < 0
+
+    def destroy(self):
+        self.detruite = True
+
+    def boucle(self):
+        while self.planifies:
+            fonction, arguments = self.planifies.pop(0)
+            fonction(*arguments)
+
+    # Méthodes du canevas appelées par Rejeu.execute
+    def entree_canevas(self, event):
+        self.appels.append("entree")
+
+    def survol_canevas(self, event):
+        self.appels.append(("survol", event.x, event.y))
+
+    def molette(self, event):
+        self.appels.append(("molette", event.num))
+
+    def sortie_canevas(self, event):
+        self.appels.append("sortie")
+
+def test_rejeu_avec_fenetre_factice(capsys):
+    actions = [{"t": 0.0, "type": "entree"}, {"t": 0.0, "type": "survol", "x": 5, "y": 6},
+               {"t": 0.0, "type": "molette", "x": 5, "y": 6, "avant": True}, {"t": 0.02, "type": "sortie"}]
+    fenetre = FenetreFactice(nb_sondages_rendu=3)
+    rejeu = Rejeu(fenetre, actions)
+    rejeu.lance()
+    fenetre.boucle()
+    # Actions exécutées dans l'ordre, fenêtre fermée et rapport affiché à la fin du script
+    assert fenetre.appels == ["entree", ("survol", 5, 6), ("molette", 4), "sortie"]
+    assert fenetre.detruite and "molette (1 actions)" in capsys.readouterr().out
+    # Latence de la molette mesurée à la fin du calcul exact (quatrième sondage), et non au déclenchement
+    assert sorted(rejeu.latences) == ["entree", "molette", "sortie", "survol"]
+    assert fenetre.nb_sondages_rendu == -1
+    assert rejeu.latences["molette"][0] > rejeu.latences["survol"][0] > rejeu.latences["entree"][0]
+
+def test_enregistrement_entree_et_sortie_du_canevas():
+    # Les entrées et sorties sont enregistrées pour que le rejeu retrouve l'état souris_dedans
+    enregistrements = []
+    canevas = SimpleNamespace(zoom=False, parent=SimpleNamespace(
+        enregistre=lambda type, **donnees: enregistrements.append(type), efface_coordonnees_souris=lambda: None))
+    CanvasMandel.entree_canevas(canevas, None)
+    assert canevas.souris_dedans
+    CanvasMandel.sortie_canevas(canevas, None)
+    assert not canevas.souris_dedans and enregistrements == ["entree", "sortie"]
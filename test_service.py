@@ -0,0 +1,106 @@
+import json
+import urllib.request, urllib.error
+import threading
+import numpy as np
+from ensemble_Mandelbrot import Mandelbrot, MandelbrotDistant
+from service_Mandelbrot import ServiceMandelbrot, Tache, cree_serveur, encode_ensemble, decode_ensemble
+
+def calcul_local(largeur, hauteur, xa, xb, ya, n_iter):
+    mandelbrot = Mandelbrot(largeur, hauteur, xa, xb, ya, n_iter)
+    mandelbrot.calcul_ensemble()
+    return mandelbrot.ensemble
+
+def test_client_http_egal_calcul_local():
+    serveur = cree_serveur(0)
+    threading.Thread(target=serveur.serve_forever, daemon=True).start()
+    try:
+        url = f"http://127.0.0.1:{serveur.server_address[1]}"
+        distant = MandelbrotDistant(url, 150, 100, -2.0, 1.0, 1.5, 100)
+        distant.calcul_ensemble()
+        assert (distant.ensemble == calcul_local(150, 100, -2.0, 1.0, 1.5, 100)).all()
+    finally:
+        serveur.shutdown()
+        serveur.server_close()
+
+def test_encodage_decodage():
+    ensemble = calcul_local(37, 23, -2.0, 1.0, 1.5, 50)
+    for format in ("octets", "bits"):
+        assert (decode_ensemble(encode_ensemble(ensemble, format), format, 37, 23) == ensemble).all()
+
+def test_demandes_identiques_calculees_une_fois():
+    service = ServiceMandelbrot(nb_travailleurs=1)
+    resultats = []
+    clients = [threading.Thread(target=lambda: resultats.append(service.rendu(-2.0, 1.0, 1.5, 200, 200, 200))) for _ in range(8)]
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+    assert len(resultats) == 8
+    assert service.nb_calculs == 1
+    # Une nouvelle demande identique est servie par le cache
+    service.rendu(-2.0, 1.0, 1.5, 200, 200, 200)
+    assert service.nb_calculs == 1
+
+def test_lot_de_petites_taches_egal_calculs_individuels():
+    service = ServiceMandelbrot(nb_travailleurs=0)
+    bornes = [(-2.0 + 0.1*i, 0.5, 1.0 - 0.05*i) for i in range(5)]
+    lot = [Tache((xa, xb, ya, 64, 48, 100)) for xa, xb, ya in bornes]
+    service.calcule_lot(lot)
+    assert service.nb_calculs == 1
+    for tache, (xa, xb, ya) in zip(lot, bornes):
+        assert (tache.ensemble == calcul_local(64, 48, xa, xb, ya, 100)).all()
+
+def test_demandes_invalides_refusees_avant_calcul():
+    service = ServiceMandelbrot(nb_travailleurs=0, pixels_max=1000)
+    for demande in [(-2.0, 1.0, 1.5, 0, 10, 100), (-2.0, 1.0, 1.5, 10, -1, 100), (-2.0, 1.0, 1.5, 10, 10, 0),
+                    (-2.0, 1.0, 1.5, 10.5, 10, 100), (1.0, -2.0, 1.5, 10, 10, 100), (-2.0, float("nan"), 1.5, 10, 10, 100),
+                    (-2.0, 1.0, "1.5", 10, 10, 100), (-2.0, 1.0, 1.5, 100, 100, 100)]:
+        try:
+            service.rendu(*demande)
+            assert False, demande
+        except ValueError:
+            pass
+    assert service.file.qsize() == 0 and service.en_cours == {}
+
+def test_erreurs_http():
+    serveur = cree_serveur(0)
+    threading.Thread(target=serveur.serve_forever, daemon=True).start()
+    try:
+        url = f"http://127.0.0.1:{serveur.server_address[1]}/rendu"
+        for demande in ({"xa": -2.0, "xb": 1.0, "ya": 1.5, "largeur": 0, "hauteur": 10, "n_iter": 100},
+                        {"xa": -2.0, "xb": 1.0, "ya": 1.5, "largeur": 10, "hauteur": 10, "n_iter": 100, "format": "png"},
+                        [1, 2, 3]):
+            requete = urllib.request.Request(url, data=json.dumps(demande).encode())
+            try:
+                urllib.request.urlopen(requete)
+                assert False, demande
+            except urllib.error.HTTPError as erreur:
+                assert erreur.code == 400
+        assert serveur.service.etat()["calculs"] == 0
+    finally:
+        serveur.shutdown()
+        serveur.server_close()
+
+def test_client_sans_service_calcul_local():
+    # Port libéré juste après sa réservation : aucun service n'y répond
+    serveur = cree_serveur(0)
+    port = serveur.server_address[1]
+    serveur.server_close()
+    distant = MandelbrotDistant(f"http://127.0.0.1:{port}", 150, 100, -2.0, 1.0, 1.5, 100)
+    distant.calcul_ensemble()
+    assert (distant.ensemble == calcul_local(150, 100, -2.0, 1.0, 1.5, 100)).all()
+
+def test_cache_limite_en_octets():
+    # Ensembles de 200 x 200 = 40000 octets : le cache de 100000 octets n'en garde que les deux plus récents
+    service = ServiceMandelbrot(nb_travailleurs=1, octets_cache=100000)
+    for ya in (1.5, 1.4, 1.3):
+        service.rendu(-2.0, 1.0, ya, 200, 200, 50)
+    assert service.etat()["cache"] == 2 and service.etat()["octets_cache"] == 80000
+    assert list(service.cache) == [(-2.0, 1.0, 1.4, 200, 200, 50), (-2.0, 1.0, 1.3, 200, 200, 50)]
+
+def test_delai_d_attente_selon_la_taille_de_la_demande():
+    petit = MandelbrotDistant("http://127.0.0.1:1", 100, 100, -2.0, 1.0, 1.5, 100)
+    grand = MandelbrotDistant("http://127.0.0.1:1", 4096, 4096, -2.0, 1.0, 1.5, 10000)
+    assert MandelbrotDistant.delai_reponse <= petit.delai_attente() < MandelbrotDistant.delai_reponse + 1
+    # Calcul le plus lent du service (tous les pixels itérés n_iter fois, à environ 5 ns par itération) couvert
+    assert grand.delai_attente() > 4096 * 4096 * 10000 * 5e-9
@@ -0,0 +1,70 @@
+import numpy as np
+from ensemble_Mandelbrot import Mandelbrot
+
+def calcul_ensemble_complet(mandelbrot):
+    # Calcul de référence sur toutes les lignes, sans exploiter la symétrie
+    zone = mandelbrot.zone
+    c = zone.pix_to_x(zone.im_pix.mat_px) + 1j * zone.pix_to_y(zone.im_pix.mat_py)
+    z = np.zeros(c.shape, dtype=complex)
+    for n in range(mandelbrot.n_iter):
+        z = z*z + c
+    return np.abs(z) < 2
+
+def verifie_egalite(largeur, hauteur, xa, xb, ya, n_iter=100):
+    mandelbrot = Mandelbrot(largeur, hauteur, xa, xb, ya, n_iter)
+    mandelbrot.calcul_ensemble()
+    assert (mandelbrot.ensemble == calcul_ensemble_complet(mandelbrot)).all()
+    return mandelbrot
+
+def test_zone_usuelle_axe_au_milieu():
+    mandelbrot = verifie_egalite(200, 200, -2.0, 1.0, 1.5)
+    debut, fin, lignes_miroir, _ = mandelbrot.zone.lignes_symetriques()
+    assert (debut, fin) == (0, 101) and lignes_miroir == slice(101, 200)
+
+def test_zone_usuelle_nombre_impair_de_lignes():
+    mandelbrot = verifie_egalite(201, 201, -2.0, 1.0, 1.5)
+    assert mandelbrot.zone.lignes_symetriques()[2] is not None
+
+def test_axe_dans_la_moitie_haute():
+    # k = 2 * 0.5 / 0.01 = 100 < 300 : lignes du haut recopiées, reste asymétrique en bas
+    mandelbrot = verifie_egalite(300, 300, -2.0, 1.0, 0.5)
+    debut, fin, lignes_miroir, _ = mandelbrot.zone.lignes_symetriques()
+    assert (debut, fin) == (50, 300) and lignes_miroir == slice(0, 50)
+
+def test_axe_dans_la_moitie_basse():
+    # k = 2 * 2.0 / 0.01 = 400 > 300 : lignes du bas recopiées
+    mandelbrot = verifie_egalite(300, 300, -2.0, 1.0, 2.0)
+    debut, fin, lignes_miroir, _ = mandelbrot.zone.lignes_symetriques()
+    assert (debut, fin) == (0, 201) and lignes_miroir == slice(201, 300)
+
+def test_lignes_non_alignees_sur_l_axe():
+    # k = 2 * 1.505 / 0.015 = 200.67 : zone demandée conservée, toutes les lignes sont calculées
+    mandelbrot = verifie_egalite(200, 200, -2.0, 1.0, 1.505)
+    assert mandelbrot.zone.A.y == 1.505
+    assert mandelbrot.zone.lignes_symetriques() == (0, 200, None, None)
+
+def test_alignement_sur_l_axe():
+    # Après alignement (interface), ya est décalé de moins d'un quart de pixel pour que k = 201
+    mandelbrot = Mandelbrot(200, 200, -2.0, 1.0, 1.505, 100)
+    mandelbrot.zone.aligne_sur_axe()
+    assert abs(mandelbrot.zone.A.y - 1.505) < mandelbrot.zone.Kxy / 4
+    assert mandelbrot.zone.lignes_symetriques() == (0, 101, slice(101, 200), slice(2, 101))
+    mandelbrot.calcul_ensemble()
+    assert (mandelbrot.ensemble == calcul_ensemble_complet(mandelbrot)).all()
+
+def test_zooms_quelconques_autour_de_l_axe():
+    # Cadres de zoom aux coordonnées fractionnaires (comme à la molette) chevauchant l'axe
+    generateur = np.random.default_rng(0)
+    for _ in range(20):
+        mandelbrot = Mandelbrot(200, 200, -2.0, 1.0, 1.5, 100)
+        pxa, pya = generateur.uniform(0, 90, 2)
+        cote = generateur.uniform(110, 200 - max(pxa, pya))
+        mandelbrot.zone.maj_bornes_zoom(pxa, pxa + cote, pya)
+        mandelbrot.zone.aligne_sur_axe()
+        assert mandelbrot.zone.lignes_symetriques()[2] is not None
+        mandelbrot.calcul_ensemble()
+        assert (mandelbrot.ensemble == calcul_ensemble_complet(mandelbrot)).all()
+
+def test_zone_ne_chevauchant_pas_l_axe():
+    mandelbrot = verifie_egalite(200, 200, -1.5, -0.75, -0.337)
+    assert mandelbrot.zone.lignes_symetriques() == (0, 200, None, None)